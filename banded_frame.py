@@ -0,0 +1,198 @@
+import framebuf
+from array import array
+
+
+"""
+
+2026-10-18: BandedFrame -> stands in for the RGB565 framebuf of a large TFT, drawing calls are recorded as compact
+            op records and replayed per horizontal band (y shifted) into a band buffer of a few rows,
+            MonoDisplay(tft_band_rows=n) streams the frame band by band instead of keeping all of it in RAM
+
+"""
+
+
+# op codes, followed by their int args (16 bit, coordinates are signed):
+_FILL = 0  # color
+_PIXEL = 1  # x, y, color
+_HLINE = 2  # x, y, w, color
+_VLINE = 3  # x, y, h, color
+_LINE = 4  # x1, y1, x2, y2, color
+_RECT = 5  # x, y, w, h, color
+_FILL_RECT = 6  # x, y, w, h, color
+_TEXT = 7  # index of the string in _objs, x, y, color
+_BLIT = 8  # index of (fbuf, key, palette) in _objs, x, y
+_ARGS = (1, 3, 4, 4, 5, 5, 5, 4, 3)
+
+_COMPACT_MIN = 512  # words in the op list before overdrawn ops are looked for
+
+
+def _s16(v):
+    return v - 0x10000 if v & 0x8000 else v
+
+
+class BandedFrame:
+    def __init__(self, width, height, band_rows, fmt=framebuf.RGB565, bytes_per_px=2):
+        self.width = width
+        self.height = height
+        self.rows = band_rows
+        self.band_data = memoryview(bytearray(width * band_rows * bytes_per_px))
+        self._band = framebuf.FrameBuffer(self.band_data, width, band_rows, fmt)
+        self._ops = array('H')
+        self._objs = []  # strings and blitted framebufs, they have to stay unchanged until the next fill()
+        self._compact_at = _COMPACT_MIN
+        self.top = None  # first row of the frame in the band buffer, None once the op list changed
+
+    def _add(self, *words):
+        self._ops.extend([w & 0xFFFF for w in words])
+        self.top = None
+        if len(self._ops) > self._compact_at:
+            self._compact()
+
+    # --------  framebuf drawing API, recorded  --------
+    def fill(self, c):
+        """ Nothing drawn before a fill shows up in the frame, the op list starts over """
+        self._ops = array('H', [_FILL, c & 0xFFFF])
+        self._objs = []
+        self._compact_at = _COMPACT_MIN
+        self.top = None
+
+    def pixel(self, x, y, c=None):
+        if c is None:  # read back: render the band holding the row
+            if not (0 <= x < self.width and 0 <= y < self.height):
+                return 0
+            self.render(y - y % self.rows)
+            return self._band.pixel(x, y - self.top)
+        self._add(_PIXEL, x, y, c)
+
+    def hline(self, x, y, w, c):
+        self._add(_HLINE, x, y, w, c)
+
+    def vline(self, x, y, h, c):
+        self._add(_VLINE, x, y, h, c)
+
+    def line(self, x1, y1, x2, y2, c):
+        self._add(_LINE, x1, y1, x2, y2, c)
+
+    def rect(self, x, y, w, h, c, f=False):
+        self._add(_FILL_RECT if f else _RECT, x, y, w, h, c)
+
+    def fill_rect(self, x, y, w, h, c):
+        self._add(_FILL_RECT, x, y, w, h, c)
+
+    def text(self, s, x, y, c=1):
+        self._objs.append(s)
+        self._add(_TEXT, len(self._objs) - 1, x, y, c)
+
+    def blit(self, fbuf, x, y, key=-1, palette=None):
+        self._objs.append((fbuf, key, palette))
+        self._add(_BLIT, len(self._objs) - 1, x, y)
+    # --------  framebuf drawing API END  --------
+
+    def _bounds(self, i):
+        """ Returns (y0, y1) of the op at i, rows it may paint """
+        ops, op = self._ops, self._ops[i]
+        if op == _FILL:
+            return 0, self.height - 1
+        if op == _TEXT:
+            y = _s16(ops[i + 3])
+            return y, y + 7
+        elif op == _BLIT:
+            return _s16(ops[i + 3]), self.height - 1  # size of a framebuf is not known
+        y = _s16(ops[i + 2])
+        if op == _PIXEL or op == _HLINE:
+            return y, y
+        elif op == _LINE:
+            y2 = _s16(ops[i + 4])
+            return min(y, y2), max(y, y2)
+        elif op == _VLINE:
+            return y, y + _s16(ops[i + 3]) - 1
+        return y, y + _s16(ops[i + 4]) - 1  # rect, fill_rect
+
+    def _compact(self):
+        """ Drop the ops painted over by a later opaque fill_rect, the op list of a screen that's redrawn
+        without fill() (status icons, switches) stays the size of what's visible """
+        ops = self._ops
+        starts = []
+        i = 0
+        while i < len(ops):
+            starts.append(i)
+            i += 1 + _ARGS[ops[i]]
+        covers = []  # opaque rectangles drawn after the op being checked, newest first
+        keep = []
+        for i in reversed(starts):
+            op = ops[i]
+            if op == _FILL_RECT:
+                x, y, w, h = _s16(ops[i + 1]), _s16(ops[i + 2]), _s16(ops[i + 3]), _s16(ops[i + 4])
+            elif op in (_PIXEL, _HLINE, _VLINE, _RECT):
+                x, y = _s16(ops[i + 1]), _s16(ops[i + 2])
+                w = 1 if op == _PIXEL or op == _VLINE else _s16(ops[i + 3])
+                h = 1 if op == _PIXEL or op == _HLINE else _s16(ops[i + 3 + (op == _RECT)])
+            elif op == _TEXT:
+                x, y = _s16(ops[i + 2]), _s16(ops[i + 3])
+                w, h = len(self._objs[ops[i + 1]]) * 8, 8
+            else:
+                keep.append(i)  # lines, blits and fills are kept as they are
+                continue
+            covered = False
+            for cx0, cy0, cx1, cy1 in covers:
+                if cx0 <= x and cy0 <= y and x + w <= cx1 and y + h <= cy1:
+                    covered = True
+                    break
+            if covered:
+                continue
+            keep.append(i)
+            if op == _FILL_RECT and len(covers) < 16:
+                covers.append((x, y, x + w, y + h))
+        kept = array('H')
+        objs = []
+        for i in reversed(keep):
+            start = len(kept)
+            kept.extend(ops[i:i + 1 + _ARGS[ops[i]]])
+            if ops[i] == _TEXT or ops[i] == _BLIT:  # strings and framebufs of dropped ops are let go
+                objs.append(self._objs[ops[i + 1]])
+                kept[start + 1] = len(objs) - 1
+        self._ops = kept
+        self._objs = objs
+        self._compact_at = max(_COMPACT_MIN, len(kept) * 2)
+
+    def render(self, top):
+        """ Replay the ops painting rows top..top + rows - 1 into the band buffer """
+        if self.top == top:
+            return
+        band, ops, objs = self._band, self._ops, self._objs
+        bottom = top + self.rows - 1
+        band.fill(0)  # a frame which was never filled is black, as a fresh framebuf
+        i = 0
+        n = len(ops)
+        while i < n:
+            op = ops[i]
+            step = 1 + _ARGS[op]
+            y0, y1 = self._bounds(i)
+            if y1 < top or y0 > bottom:
+                i += step
+                continue
+            if op == _FILL:
+                band.fill(ops[i + 1])
+            elif op == _PIXEL:
+                band.pixel(_s16(ops[i + 1]), y0 - top, ops[i + 3])
+            elif op == _HLINE:
+                band.hline(_s16(ops[i + 1]), y0 - top, _s16(ops[i + 3]), ops[i + 4])
+            elif op == _VLINE:
+                band.vline(_s16(ops[i + 1]), y0 - top, _s16(ops[i + 3]), ops[i + 4])
+            elif op == _LINE:
+                band.line(_s16(ops[i + 1]), _s16(ops[i + 2]) - top, _s16(ops[i + 3]), _s16(ops[i + 4]) - top,
+                          ops[i + 5])
+            elif op == _RECT:
+                band.rect(_s16(ops[i + 1]), y0 - top, _s16(ops[i + 3]), _s16(ops[i + 4]), ops[i + 5])
+            elif op == _FILL_RECT:
+                band.fill_rect(_s16(ops[i + 1]), y0 - top, _s16(ops[i + 3]), _s16(ops[i + 4]), ops[i + 5])
+            elif op == _TEXT:
+                band.text(objs[ops[i + 1]], _s16(ops[i + 2]), y0 - top, ops[i + 4])
+            elif op == _BLIT:
+                fbuf, key, palette = objs[ops[i + 1]]
+                if palette is None:
+                    band.blit(fbuf, _s16(ops[i + 2]), y0 - top, key)
+                else:
+                    band.blit(fbuf, _s16(ops[i + 2]), y0 - top, key, palette)
+            i += step
+        self.top = top
@@ -21,8 +21,8 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
-from micropython import const
-from time import sleep_ms
+from micropython import const, schedule
+from time import sleep_ms, sleep_us
 import ustruct
 
 # Display resolution
@@ -31,6 +31,8 @@ EPD_HEIGHT = const(200)
 
 # Display commands
 DRIVER_OUTPUT_CONTROL                = const(0x01)
+GATE_DRIVING_VOLTAGE                 = const(0x03)
+SOURCE_DRIVING_VOLTAGE               = const(0x04)
 BOOSTER_SOFT_START_CONTROL           = const(0x0C)
 GATE_SCAN_START_POSITION             = const(0x0F)
 DEEP_SLEEP_MODE                      = const(0x10)
@@ -41,9 +43,11 @@ MASTER_ACTIVATION                    = const(0x20)
 DISPLAY_UPDATE_CONTROL_1             = const(0x21)
 DISPLAY_UPDATE_CONTROL_2             = const(0x22)
 WRITE_RAM                            = const(0x24)
+WRITE_RAM_PREVIOUS                   = const(0x26) # image the partial waveform compares against
 WRITE_VCOM_REGISTER                  = const(0x2C)
 WRITE_LUT_REGISTER                   = const(0x32)
 SET_DUMMY_LINE_PERIOD                = const(0x3A)
+END_OPTION                           = const(0x3F)
 SET_GATE_TIME                        = const(0x3B) # not in datasheet
 BORDER_WAVEFORM_CONTROL              = const(0x3C)
 SET_RAM_X_ADDRESS_START_END_POSITION = const(0x44)
@@ -54,6 +58,9 @@ TERMINATE_FRAME_READ_WRITE           = const(0xFF) # aka NOOP
 
 BUSY = const(1)  # 1=busy, 0=idle
 
+FILL_ROWS = const(40)  # rows per SPI transaction when filling the frame memory with one color
+BUSY_RISE_POLLS = const(50)  # 100 us polls for BUSY to rise after MASTER_ACTIVATION (5 ms at most)
+
 class EPD:
     def __init__(self, spi, cs, dc, rst, busy):
         self.spi = spi
@@ -67,10 +74,15 @@ class EPD:
         self.busy.init(self.busy.IN)
         self.width = EPD_WIDTH
         self.height = EPD_HEIGHT
+        self._fill_buf = bytearray(EPD_WIDTH // 8 * FILL_ROWS)  # reused by every fill
+        self._fill_color = 0x00
+        self._partial_lut = False  # partial LUT in the LUT register (a full update reloads it from OTP)
+        self._idle_callback = None
 
-    LUT_FULL_UPDATE = bytearray(b'0x80,0x48,0x40,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x40,0x48,0x80,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x80,0x48,0x40,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x40,0x48,0x80,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0xA,0x0,0x0,0x0,0x0,0x0,0x0,0x8,0x1,0x0,0x8,0x1,0x0,0x2,0xA,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x22,0x22,0x22,0x22,0x22,0x22,0x0,0x0,0x0,0x22,0x17,0x41,0x0,0x32,0x20')
+    # 153 bytes waveform, then end option, gate voltage, source voltage (3) and VCOM, see set_lut()
+    LUT_FULL_UPDATE = b'\x80\x48\x40\x00\x00\x00\x00\x00\x00\x00\x00\x00\x40\x48\x80\x00\x00\x00\x00\x00\x00\x00\x00\x00\x80\x48\x40\x00\x00\x00\x00\x00\x00\x00\x00\x00\x40\x48\x80\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x0a\x00\x00\x00\x00\x00\x00\x08\x01\x00\x08\x01\x00\x02\x0a\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x22\x22\x22\x22\x22\x22\x00\x00\x00\x22\x17\x41\x00\x32\x20'
     
-    LUT_PARTIAL_UPDATE = bytearray(b'0x0,0x40,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x80,0x80,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x40,0x40,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x80,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0xF,0x0,0x0,0x0,0x0,0x0,0x0,0x1,0x1,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x0,0x22,0x22,0x22,0x22,0x22,0x22,0x0,0x0,0x0,0x02,0x17,0x41,0xB0,0x32,0x28')
+    LUT_PARTIAL_UPDATE = b'\x00\x40\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x80\x80\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x40\x40\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x80\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x0f\x00\x00\x00\x00\x00\x00\x01\x01\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x22\x22\x22\x22\x22\x22\x00\x00\x00\x02\x17\x41\xb0\x32\x28'
 
     def _command(self, command, data=None):
         self.dc(0)
@@ -99,9 +111,39 @@ class EPD:
         self._command(DATA_ENTRY_MODE_SETTING, b'\x03') # X increment Y increment
         self.set_lut(self.LUT_FULL_UPDATE)
 
+    def is_busy(self):
+        return self.busy.value() == BUSY
+
     def wait_until_idle(self):
+        # adaptive poll: short waits first, the overshoot stays below 20 ms even for multi-second refreshes
+        delay = 1
         while self.busy.value() == BUSY:
-            sleep_ms(100)
+            sleep_ms(delay)
+            delay = min(delay * 2, 20)
+
+    # BUSY rises a moment after MASTER_ACTIVATION, until then the panel looks idle while the refresh has
+    # already started: wait for the rise, a refresh too fast to see it (or a BUSY pin not wired) gives up
+    def wait_until_busy(self):
+        for _ in range(BUSY_RISE_POLLS):
+            if self.busy.value() == BUSY:
+                return True
+            sleep_us(100)
+        return False
+
+    # call callback() once, from the scheduler, when the BUSY pin falls (the refresh is done)
+    def on_idle(self, callback):
+        self._idle_callback = callback
+        self.busy.irq(handler=self._busy_irq, trigger=self.busy.IRQ_FALLING)
+        if not self.is_busy():
+            self._busy_irq(self.busy)  # done already, or too fast to catch the edge
+
+    def _busy_irq(self, pin):
+        callback = self._idle_callback
+        if callback is None:
+            return
+        self._idle_callback = None
+        pin.irq(handler=None)
+        schedule(callback, None)
 
     def reset(self):
         self.rst(0)
@@ -110,10 +152,14 @@ class EPD:
         sleep_ms(200)
 
     def set_lut(self, lut):
-        self._command(WRITE_LUT_REGISTER, lut)
+        self._command(WRITE_LUT_REGISTER, lut[:153])
+        self._command(END_OPTION, lut[153:154])
+        self._command(GATE_DRIVING_VOLTAGE, lut[154:155])
+        self._command(SOURCE_DRIVING_VOLTAGE, lut[155:158])
+        self._command(WRITE_VCOM_REGISTER, lut[158:159])
 
     # put an image in the frame memory
-    def set_frame_memory(self, image, x, y, w, h):
+    def set_frame_memory(self, image, x, y, w, h, chunk=0, ram=WRITE_RAM):
         # x point must be the multiple of 8 or the last 3 bits will be ignored
         x = x & 0xF8
         w = w & 0xF8
@@ -130,19 +176,65 @@ class EPD:
 
         self.set_memory_area(x, y, x_end, y_end)
         self.set_memory_pointer(x, y)
-        self._command(WRITE_RAM, image)
+        if chunk:
+            # limit the bytes per SPI transaction
+            self._command(ram)
+            for i in range(0, len(image), chunk):
+                self._data(image[i:i + chunk])
+        else:
+            self._command(ram, image)
 
-    # replace the frame memory with the specified color
-    def clear_frame_memory(self, color):
+    # put the image in the previous image RAM as well, partial updates drive only the pixels that differ
+    def set_previous_frame_memory(self, image, x, y, w, h, chunk=0):
+        self.set_frame_memory(image, x, y, w, h, chunk, WRITE_RAM_PREVIOUS)
+
+    # replace the frame memory with the color, and the previous image (previous=True) so partial updates start
+    # from the same, full updates don't read it
+    def clear_frame_memory(self, color, previous=True):
+        self._fill_frame_memory(color, WRITE_RAM)
+        if previous:
+            self._fill_frame_memory(color, WRITE_RAM_PREVIOUS)
+
+    def _fill_frame_memory(self, color, ram):
         self.set_memory_area(0, 0, self.width - 1, self.height - 1)
         self.set_memory_pointer(0, 0)
-        self._command(WRITE_RAM)
-        # send the color data
-        for i in range(0, self.width // 8 * self.height):
-            self._data(bytearray([color]))
+        self._command(ram)
+        # send the color data, FILL_ROWS rows at a time from the preallocated buffer
+        buf = self._fill_buf
+        if self._fill_color != color:
+            for i in range(len(buf)):
+                buf[i] = color
+            self._fill_color = color
+        size = self.width // 8 * self.height
+        for i in range(0, size, len(buf)):
+            self._data(buf if size - i >= len(buf) else memoryview(buf)[:size - i])
+
+    # show the frame memory inverted (or normal again) on the next display_frame(), RAM stays untouched
+    # display update control 1: BW RAM option 0x08 = inverse, 0x00 = normal
+    def invert_frame_memory(self, invert):
+        self._command(DISPLAY_UPDATE_CONTROL_1, b'\x08' if invert else b'\x00')
 
     # draw the current frame memory and switch to the next memory area
-    def display_frame(self):
+    # partial=True -> differential waveform from the host loaded partial LUT, no flashing, ghosting builds up
+    # callback -> return at once, callback(None) is scheduled when the panel is idle again
+    def display_frame(self, wait=True, partial=False, callback=None):
+        if partial:
+            if not self._partial_lut:
+                self.set_lut(self.LUT_PARTIAL_UPDATE)
+                self._command(BORDER_WAVEFORM_CONTROL, b'\x80')
+                self._partial_lut = True
+            self._command(DISPLAY_UPDATE_CONTROL_2, b'\xCF')  # display mode 2, LUT from register
+            self._command(MASTER_ACTIVATION)
+            self.wait_until_busy()
+            if callback is not None:
+                self.on_idle(callback)
+            elif wait:
+                self.wait_until_idle()
+            return
+        if self._partial_lut:
+            self._command(BORDER_WAVEFORM_CONTROL, b'\xC0')  # POR value
+            self._partial_lut = False
+
         #self._command(DISPLAY_UPDATE_CONTROL_2, b'\xC4')
         #self._command(MASTER_ACTIVATION)
         #self._command(TERMINATE_FRAME_READ_WRITE)
@@ -151,7 +243,11 @@ class EPD:
         # it works only this way: (implemented from arduino c++ driver
         self._command(0x22)
         self._command(0x20)
-        self.wait_until_idle()
+        self.wait_until_busy()
+        if callback is not None:
+            self.on_idle(callback)
+        elif wait:
+            self.wait_until_idle()
 
     # specify the memory area for data R/W
     def set_memory_area(self, x_start, y_start, x_end, y_end):
@@ -172,4 +268,4 @@ class EPD:
     # to wake call reset() or init()
     def sleep(self):
         self._command(DEEP_SLEEP_MODE, b'\x01') # enter deep sleep A0=1, A0=0 power on
-        self.wait_until_idle()
\ No newline at end of file
+        self.wait_until_idle()
\ No newline at end of file
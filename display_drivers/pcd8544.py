@@ -25,7 +25,6 @@ SOFTWARE.
 """
 
 from micropython import const
-from ustruct import pack
 from utime import sleep_us
 
 
@@ -78,6 +77,11 @@ class PCD8544:
         self.height = PCD8544_HEIGHT  # For Writer class
         self.width = PCD8544_WIDTH
 
+        # preallocated, so commands and flushes don't allocate on the heap
+        self._cmdbuf = bytearray(1)
+        self._posbuf = bytearray(2)
+        self._zeros = bytes(PCD8544_WIDTH)  # one bank
+
         self.cs.init(self.cs.OUT, value=1)
         self.dc.init(self.dc.OUT, value=0)
 
@@ -134,7 +138,12 @@ class PCD8544:
 
     def clear(self):
         # clear DDRAM, reset x,y position to 0,0
-        self.data([0] * (PCD8544_HEIGHT * PCD8544_WIDTH // 8))
+        self.position(0, 0)
+        self.dc(1)
+        self.cs(0)
+        for _ in range(PCD8544_HEIGHT // 8):
+            self.spi.write(self._zeros)
+        self.cs(1)
         self.position(0, 0)
 
     def addressing(self, horizontal=True):
@@ -147,17 +156,23 @@ class PCD8544:
 
     def position(self, x, y):
         # set cursor to column x (0~83), bank y (0~5)
-        self.cmd(COL_ADDR | x)  # set x pos (0~83)
-        self.cmd(BANK_ADDR | y) # set y pos (0~5)
+        self._posbuf[0] = COL_ADDR | x  # set x pos (0~83)
+        self._posbuf[1] = BANK_ADDR | y # set y pos (0~5)
+        self.dc(0)
+        self.cs(0)
+        self.spi.write(self._posbuf)
+        self.cs(1)
 
     def cmd(self, command):
+        self._cmdbuf[0] = command
         self.dc(0)
         self.cs(0)
-        self.spi.write(bytearray([command]))
+        self.spi.write(self._cmdbuf)
         self.cs(1)
 
     def data(self, data):
+        # data is any buffer (bytearray, bytes, memoryview slice of the framebuffer), written as it is
         self.dc(1)
         self.cs(0)
-        self.spi.write(pack('B'*len(data), *data))
+        self.spi.write(data)
         self.cs(1)
@@ -99,6 +99,12 @@ class SH1106(framebuf.FrameBuffer):
         self.bufsize = self.pages * self.width
         self.renderbuf = bytearray(self.bufsize)
         self.pages_to_update = 0
+        # changed display columns of each page flagged in pages_to_update
+        self.page_x0 = [0] * self.pages
+        self.page_x1 = [self.width - 1] * self.pages
+        # memoryviews of the display buffer pages, rebuilt if displaybuf is swapped
+        self.page_views = None
+        self.page_views_of = None
 
         if self.rotate90:
             self.displaybuf = bytearray(self.bufsize)
@@ -157,78 +163,133 @@ class SH1106(framebuf.FrameBuffer):
         # self.* lookups in loops take significant time (~4fps).
         (w, p, db, rb) = (self.width, self.pages,
                           self.displaybuf, self.renderbuf)
-        if self.rotate90:
-            for i in range(self.bufsize):
-                db[w * (i % p) + (i // p)] = rb[i]
         if full_update:
-            pages_to_update = (1 << self.pages) - 1
-        else:
-            pages_to_update = self.pages_to_update
+            self.register_updates(0, self.bufsize)
+        if self.rotate90:
+            # remap only the changed columns of the changed pages
+            for page in range(p):
+                if self.pages_to_update & (1 << page):
+                    for col in range(self.page_x0[page], self.page_x1[page] + 1):
+                        db[w * page + col] = rb[col * p + page]
+        self.show_pages()
+
+    def show_pages(self):
+        # send the changed columns of the pages flagged in pages_to_update, then start over
+        pages_to_update = self.pages_to_update
+        self.pages_to_update = 0
         #print("Updating pages: {:08b}".format(pages_to_update))
         for page in range(self.pages):
             if (pages_to_update & (1 << page)):
-                self.write_cmd(_SET_PAGE_ADDRESS | page)
-                self.write_cmd(_LOW_COLUMN_ADDRESS | 2)
-                self.write_cmd(_HIGH_COLUMN_ADDRESS | 0)
-                self.write_data(db[(w*page):(w*page+w)])
-        self.pages_to_update = 0
+                self.show_page(page, self.page_x0[page], self.page_x1[page])
+
+    def make_page_views(self, db):
+        # a view of every page of the display buffer, a method of its own as the
+        # closure of the comprehension would box w and mv on every show_page() call
+        w = self.width
+        mv = memoryview(db)
+        self.page_views = [mv[(w*p):(w*p+w)] for p in range(self.pages)]
+        self.page_views_of = db
+        # last column slice sent of each page, a widget redrawn in place sends
+        # the same one every time and slicing a memoryview allocates
+        self.page_cuts = list(self.page_views)
+        self.page_cut_x0 = [0] * self.pages
+        self.page_cut_x1 = [w - 1] * self.pages
+
+    def show_page(self, page, x0, x1):
+        # send columns x0..x1 of a page of the display buffer, without copying it
+        (w, db) = (self.width, self.displaybuf)
+        if self.page_views_of is not db:
+            self.make_page_views(db)
+        col = x0 + 2  # RAM is 132 columns wide, the panel starts at column 2
+        self.write_cmd(_SET_PAGE_ADDRESS | page)
+        self.write_cmd(_LOW_COLUMN_ADDRESS | (col & 0x0f))
+        self.write_cmd(_HIGH_COLUMN_ADDRESS | (col >> 4))
+        if x0 == 0 and x1 == w - 1:
+            self.write_data(self.page_views[page])
+            return
+        if x0 != self.page_cut_x0[page] or x1 != self.page_cut_x1[page]:
+            self.page_cuts[page] = self.page_views[page][x0:x1+1]
+            self.page_cut_x0[page] = x0
+            self.page_cut_x1[page] = x1
+        self.write_data(self.page_cuts[page])
 
     def pixel(self, x, y, color=None):
         if color is None:
             return super().pixel(x, y)
         else:
             super().pixel(x, y , color)
-            page = y // 8
-            self.pages_to_update |= 1 << abs(page)
+            self.register_updates(y, y, x, x)
 
     def text(self, text, x, y, color=1):
         super().text(text, x, y, color)
-        self.register_updates(y, y+7)
+        self.register_updates(y, y+7, x, x+len(text)*8-1)
 
     def line(self, x0, y0, x1, y1, color):
         super().line(x0, y0, x1, y1, color)
-        self.register_updates(y0, y1)
+        self.register_updates(y0, y1, x0, x1)
 
     def hline(self, x, y, w, color):
         super().hline(x, y, w, color)
-        self.register_updates(y)
+        self.register_updates(y, y, x, x+w-1)
 
     def vline(self, x, y, h, color):
         super().vline(x, y, h, color)
-        self.register_updates(y, y+h-1)
+        self.register_updates(y, y+h-1, x, x)
 
     def fill(self, color):
         super().fill(color)
-        self.pages_to_update = (1 << self.pages) - 1
+        self.register_updates(0, self.bufsize)
 
-    def blit(self, fbuf, x, y, key=-1, palette=None):
+    def blit(self, fbuf, x, y, key=-1, palette=None, w=None, h=None):
         super().blit(fbuf, x, y, key, palette)
-        self.register_updates(y, y+self.height)
+        # a plain FrameBuffer doesn't tell its size, pass w and h of fbuf,
+        # without them everything right and below of x, y may have changed
+        if w is None:
+            w = getattr(fbuf, "width", self.bufsize)
+        if h is None:
+            h = getattr(fbuf, "height", self.bufsize)
+        self.register_updates(y, y+h-1, x, x+w-1)
 
     def scroll(self, x, y):
         # my understanding is that scroll() does a full screen change
         super().scroll(x, y)
-        self.pages_to_update =  (1 << self.pages) - 1
+        self.register_updates(0, self.bufsize)
 
     def fill_rect(self, x, y, w, h, color):
         super().fill_rect(x, y, w, h, color)
-        self.register_updates(y, y+h-1)
+        self.register_updates(y, y+h-1, x, x+w-1)
 
     def rect(self, x, y, w, h, color):
         super().rect(x, y, w, h, color)
-        self.register_updates(y, y+h-1)
-
-    def register_updates(self, y0, y1=None):
-        # this function takes the top and optional bottom address of the changes made
-        # and updates the pages_to_change list with any changed pages
-        # that are not yet on the list
-        start_page = max(0, y0 // 8)
-        end_page = max(0, y1 // 8) if y1 is not None else start_page
-        # rearrange start_page and end_page if coordinates were given from bottom to top
-        if start_page > end_page:
-            start_page, end_page = end_page, start_page
+        self.register_updates(y, y+h-1, x, x+w-1)
+
+    def register_updates(self, y0, y1=None, x0=0, x1=None):
+        # this function takes the top and optional bottom address of the changes made,
+        # optionally the left and right one too (whole rows otherwise), in drawing coordinates,
+        # and widens the changed column range of the pages they cover
+        if y1 is None:
+            y1 = y0
+        if x1 is None:
+            x1 = self.bufsize
+        # rearrange the coordinates if they were given from bottom to top or right to left
+        if y0 > y1:
+            y0, y1 = y1, y0
+        if x0 > x1:
+            x0, x1 = x1, x0
+        if self.rotate90:
+            # drawing x runs across the pages, drawing y along the display columns
+            x0, y0, x1, y1 = y0, x0, y1, x1
+        x0, x1 = max(0, x0), min(self.width - 1, x1)
+        start_page, end_page = max(0, y0 // 8), min(self.pages - 1, y1 // 8)
+        if x1 < x0:
+            return
         for page in range(start_page, end_page+1):
-            self.pages_to_update |= 1 << page
+            if self.pages_to_update & (1 << page):
+                self.page_x0[page] = min(self.page_x0[page], x0)
+                self.page_x1[page] = max(self.page_x1[page], x1)
+            else:
+                self.page_x0[page], self.page_x1[page] = x0, x1
+                self.pages_to_update |= 1 << page
 
     def reset(self, res):
         if res is not None:
@@ -247,6 +308,7 @@ class SH1106_I2C(SH1106):
         self.addr = addr
         self.res = res
         self.temp = bytearray(2)
+        self.write_list = [b'\x40', None]  # Co=0, D/C#=1
         self.delay = delay
         if res is not None:
             res.init(res.OUT, value=1)
@@ -258,7 +320,8 @@ class SH1106_I2C(SH1106):
         self.i2c.writeto(self.addr, self.temp)
 
     def write_data(self, buf):
-        self.i2c.writeto(self.addr, b'\x40'+buf)
+        self.write_list[1] = buf
+        self.i2c.writevto(self.addr, self.write_list)
 
     def reset(self):
         super().reset(self.res)
@@ -277,18 +340,20 @@ class SH1106_SPI(SH1106):
         self.res = res
         self.cs = cs
         self.delay = delay
+        self.cmdbuf = bytearray(1)
         super().__init__(width, height, external_vcc, rotate)
 
     def write_cmd(self, cmd):
+        self.cmdbuf[0] = cmd
         if self.cs is not None:
             self.cs(1)
             self.dc(0)
             self.cs(0)
-            self.spi.write(bytearray([cmd]))
+            self.spi.write(self.cmdbuf)
             self.cs(1)
         else:
             self.dc(0)
-            self.spi.write(bytearray([cmd]))
+            self.spi.write(self.cmdbuf)
 
     def write_data(self, buf):
         if self.cs is not None:
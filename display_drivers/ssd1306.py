@@ -32,6 +32,9 @@ class SSD1306(framebuf.FrameBuffer):
         self.external_vcc = external_vcc
         self.pages = self.height // 8
         self.buffer = bytearray(self.pages * self.width)
+        # changed columns of each page since the last show(), empty while x1 < x0
+        self.page_x0 = [0] * self.pages
+        self.page_x1 = [self.width - 1] * self.pages
         super().__init__(self.buffer, self.width, self.height, framebuf.MONO_VLSB)
         self.init_display()
 
@@ -85,20 +88,122 @@ class SSD1306(framebuf.FrameBuffer):
     def invert(self, invert):
         self.write_cmd(SET_NORM_INV | (invert & 1))
 
-    def show(self):
-        x0 = 0
-        x1 = self.width - 1
-        if self.width == 64:
-            # displays with width of 64 pixels are shifted by 32
-            x0 += 32
-            x1 += 32
+    def show(self, full_update=False):
+        # sends the window around the pages and columns changed since the last show()
+        if full_update:
+            self.register_updates(0, 0, self.width - 1, self.height - 1)
+        window = self.dirty_window()
+        if window is not None:
+            self.show_window(window[0], window[1], window[2], window[3])
+
+    def dirty_window(self, reset=True):
+        # returns (x0, page0, x1, page1) around the changed area or None, and starts over
+        x0, x1, page0, page1 = self.width, -1, -1, -1
+        for page in range(self.pages):
+            if self.page_x1[page] >= self.page_x0[page]:
+                if page0 < 0:
+                    page0 = page
+                page1 = page
+                x0 = min(x0, self.page_x0[page])
+                x1 = max(x1, self.page_x1[page])
+                if reset:
+                    self.page_x0[page], self.page_x1[page] = self.width, -1
+        return (x0, page0, x1, page1) if page0 >= 0 else None
+
+    def register_updates(self, x0, y0, x1, y1):
+        # marks the columns x0..x1 of the pages covering rows y0..y1 as changed, clipped to the screen
+        if x0 > x1:
+            x0, x1 = x1, x0
+        if y0 > y1:
+            y0, y1 = y1, y0
+        x0, x1 = max(0, x0), min(self.width - 1, x1)
+        y0, y1 = max(0, y0), min(self.height - 1, y1)
+        if x1 < x0 or y1 < y0:
+            return
+        for page in range(y0 // 8, y1 // 8 + 1):
+            if self.page_x1[page] < self.page_x0[page]:
+                self.page_x0[page], self.page_x1[page] = x0, x1
+            else:
+                self.page_x0[page] = min(self.page_x0[page], x0)
+                self.page_x1[page] = max(self.page_x1[page], x1)
+
+    # framebuf primitives, drawing marks the area it touched
+    def pixel(self, x, y, color=None):
+        if color is None:
+            return super().pixel(x, y)
+        super().pixel(x, y, color)
+        self.register_updates(x, y, x, y)
+
+    def text(self, text, x, y, color=1):
+        super().text(text, x, y, color)
+        self.register_updates(x, y, x + len(text) * 8 - 1, y + 7)
+
+    def line(self, x0, y0, x1, y1, color):
+        super().line(x0, y0, x1, y1, color)
+        self.register_updates(x0, y0, x1, y1)
+
+    def hline(self, x, y, w, color):
+        super().hline(x, y, w, color)
+        self.register_updates(x, y, x + w - 1, y)
+
+    def vline(self, x, y, h, color):
+        super().vline(x, y, h, color)
+        self.register_updates(x, y, x, y + h - 1)
+
+    def fill(self, color):
+        super().fill(color)
+        self.register_updates(0, 0, self.width - 1, self.height - 1)
+
+    def fill_rect(self, x, y, w, h, color):
+        super().fill_rect(x, y, w, h, color)
+        self.register_updates(x, y, x + w - 1, y + h - 1)
+
+    def rect(self, x, y, w, h, color, *fill):
+        super().rect(x, y, w, h, color, *fill)
+        self.register_updates(x, y, x + w - 1, y + h - 1)
+
+    def ellipse(self, x, y, xr, yr, color, *args):
+        super().ellipse(x, y, xr, yr, color, *args)
+        self.register_updates(x - xr, y - yr, x + xr, y + yr)
+
+    def poly(self, x, y, coords, color, *fill):
+        super().poly(x, y, coords, color, *fill)
+        # coords is usually an array('h'), MicroPython arrays can't be sliced with a step
+        x0 = x1 = coords[0]
+        y0 = y1 = coords[1]
+        for i in range(2, len(coords) - 1, 2):
+            x0, x1 = min(x0, coords[i]), max(x1, coords[i])
+            y0, y1 = min(y0, coords[i + 1]), max(y1, coords[i + 1])
+        self.register_updates(x + x0, y + y0, x + x1, y + y1)
+
+    def blit(self, fbuf, x, y, key=-1, palette=None, w=None, h=None):
+        super().blit(fbuf, x, y, key, palette)
+        # a plain FrameBuffer doesn't tell its size, pass w and h of fbuf,
+        # without them everything right and below of x, y may have changed
+        if w is None:
+            w = getattr(fbuf, "width", self.width)
+        if h is None:
+            h = getattr(fbuf, "height", self.height)
+        self.register_updates(x, y, x + w - 1, y + h - 1)
+
+    def scroll(self, xstep, ystep):
+        super().scroll(xstep, ystep)
+        self.register_updates(0, 0, self.width - 1, self.height - 1)
+
+    def show_window(self, x0, page0, x1, page1, buf=None):
+        # like show(), but the column/page address window is narrowed to the given area,
+        # buf may be a copy of the frame buffer (same layout) to send instead
+        # displays with width of 64 pixels are shifted by 32
+        shift = 32 if self.width == 64 else 0
         self.write_cmd(SET_COL_ADDR)
-        self.write_cmd(x0)
-        self.write_cmd(x1)
+        self.write_cmd(x0 + shift)
+        self.write_cmd(x1 + shift)
         self.write_cmd(SET_PAGE_ADDR)
-        self.write_cmd(0)
-        self.write_cmd(self.pages - 1)
-        self.write_data(self.buffer)
+        self.write_cmd(page0)
+        self.write_cmd(page1)
+        buf = memoryview(self.buffer if buf is None else buf)
+        for page in range(page0, page1 + 1):
+            self.write_data(buf[page * self.width + x0:page * self.width + x1 + 1])
 
 
 class SSD1306_I2C(SSD1306):
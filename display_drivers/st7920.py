@@ -22,6 +22,9 @@ ST7920_EXTEND        = const(0x34)
 ST7920_WIDTH         = const(128)
 ST7920_HEIGHT        = const(64)
 
+ST7920_TEXT_COLS     = const(16)  # CGROM half-width chars are 8x16
+ST7920_TEXT_ADDR     = (0x80, 0x90, 0x88, 0x98)  # DDRAM address of text lines 0..3
+
 
 class ST7920():  # was inherited from FrameBuffer
     def __init__(self, spi, rst=None):
@@ -30,6 +33,11 @@ class ST7920():  # was inherited from FrameBuffer
         if rst:
             self.rst.init(self.rst.OUT, value=1)
         self.cmd = bytearray(3)
+        # one GDRAM row as sent on the bus: 2 address commands + 16 data bytes, 3 bytes each (sync + 2 nibbles)
+        self.rowbuf = bytearray(6 + ST7920_WIDTH // 8 * 3)
+        self.rowview = memoryview(self.rowbuf)
+        self.sent = bytearray(ST7920_WIDTH * ST7920_HEIGHT // 8)  # GDRAM content as last sent
+        self.ddram = bytearray(b' ' * (ST7920_TEXT_COLS * len(ST7920_TEXT_ADDR)))  # text as last sent (cleared)
         #self.buf = bytearray(ST7920_WIDTH * ST7920_HEIGHT // 8)
         #super().__init__(self.buf, ST7920_WIDTH, ST7920_HEIGHT, MONO_HLSB)
         self.init()
@@ -52,16 +60,91 @@ class ST7920():  # was inherited from FrameBuffer
                     ST7920_EXTEND,
                     ST7920_EXTEND | 0x02):
             self._write(ST7920_CMD, cmd)
-        self.show(bytearray(b'0x00'))
+        self.show(self.sent, full_update=True)
+
+    def show(self, data, full_update=False):
+        return self.show_window(data, 0, 0, ST7920_WIDTH - 1, ST7920_HEIGHT - 1, full_update)
+
+    def show_window(self, data, x0, y0, x1, y1, full_update=False):
+        # send the 16 px GDRAM words covering columns x0..x1 of rows y0..y1 which differ from the last sent
+        # image (all of them with full_update), one spi.write per row: a run of changed words gets its address
+        # once, the horizontal address auto-increments after every word
+        # returns the number of data bytes sent
+        buf = self.rowbuf
+        sent = self.sent
+        w0 = x0 // 16
+        w1 = x1 // 16
+        total = 0
+        for y in range(y0, y1 + 1):
+            row = y * 16
+            n = 0
+            word = w0
+            while word <= w1:
+                i = row + word * 2
+                if not full_update and data[i] == sent[i] and data[i+1] == sent[i+1]:
+                    word += 1
+                    continue
+                addr_y = 0x80 | (y & 31)
+                addr_x = 0x80 | (word + 8 if y >= 32 else word)  # lower half of the screen continues at x 8..15
+                buf[n] = ST7920_CMD
+                buf[n+1] = addr_y & 0xF0
+                buf[n+2] = (addr_y << 4) & 0xF0
+                buf[n+3] = ST7920_CMD
+                buf[n+4] = addr_x & 0xF0
+                buf[n+5] = (addr_x << 4) & 0xF0
+                n += 6
+                while word <= w1 and (full_update or data[i] != sent[i] or data[i+1] != sent[i+1]):
+                    hi, lo = data[i], data[i+1]
+                    buf[n] = ST7920_DAT
+                    buf[n+1] = hi & 0xF0
+                    buf[n+2] = (hi << 4) & 0xF0
+                    buf[n+3] = ST7920_DAT
+                    buf[n+4] = lo & 0xF0
+                    buf[n+5] = (lo << 4) & 0xF0
+                    n += 6
+                    sent[i] = data[i]
+                    sent[i+1] = data[i+1]
+                    total += 2
+                    word += 1
+                    i += 2
+            if n:
+                self.spi.write(self.rowview[:n])
+        return total
 
-    def show(self, data):
-        for i in range(0, len(data), 2):
-            x = (i // 2) % 8
-            y = i // 16
-            if i >= len(data) // 2:
-                x += 8
-                y += 32
-            self._write(ST7920_CMD, 0x80 | y)
-            self._write(ST7920_CMD, 0x80 | x)
-            self._write(ST7920_DAT, data[i])
-            self._write(ST7920_DAT, data[i+1])
+    def text(self, row, line):
+        # write a line of CGROM text to DDRAM text row 0..3 (padded with spaces), only the 2 char cells which
+        # changed since the last call are sent, consecutive ones behind one address (it auto-increments)
+        # the text layer is shown on top of GDRAM graphics, returns the number of chars sent
+        line = line.encode()[:ST7920_TEXT_COLS]
+        line = line + b' ' * (ST7920_TEXT_COLS - len(line))
+        buf = self.rowbuf
+        ddram = self.ddram
+        start = row * ST7920_TEXT_COLS
+        n = 0
+        total = 0
+        cell = 0
+        while cell < ST7920_TEXT_COLS // 2:
+            i = cell * 2
+            if line[i] == ddram[start + i] and line[i+1] == ddram[start + i + 1]:
+                cell += 1
+                continue
+            addr = ST7920_TEXT_ADDR[row] + cell
+            buf[n] = ST7920_CMD
+            buf[n+1] = addr & 0xF0
+            buf[n+2] = (addr << 4) & 0xF0
+            n += 3
+            while cell < ST7920_TEXT_COLS // 2 and (line[i] != ddram[start + i] or line[i+1] != ddram[start + i + 1]):
+                for j in (i, i + 1):
+                    buf[n] = ST7920_DAT
+                    buf[n+1] = line[j] & 0xF0
+                    buf[n+2] = (line[j] << 4) & 0xF0
+                    ddram[start + j] = line[j]
+                    n += 3
+                total += 2
+                cell += 1
+                i += 2
+        if n:
+            self._write(ST7920_CMD, ST7920_BASIC)  # DDRAM is reachable from the basic instruction set only
+            self.spi.write(self.rowview[:n])
+            self._write(ST7920_CMD, ST7920_EXTEND | 0x02)  # back to extended set, graphic display on
+        return total
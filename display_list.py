@@ -0,0 +1,93 @@
+"""
+
+2026-10-18: DisplayList -> widget calls of a MonoDisplay recorded as op records (method, args, kwargs, bounding box),
+            MonoDisplay.begin_display_list() / end_display_list() record them, execute(display, target) replays
+            them into any framebuf of the display's size and format, diff(previous) finds the ops which changed
+
+"""
+
+
+class DisplayList:
+    def __init__(self):
+        self.ops = []  # (method name, args, kwargs items, bounding box [x0, y0, x1, y1] or None)
+
+    def __len__(self):
+        return len(self.ops)
+
+    def __iter__(self):
+        return iter(self.ops)
+
+    def add(self, name, args, kwargs, box):
+        self.ops.append((name, args, tuple(sorted(kwargs.items())) if kwargs else (), box))
+
+    def clear(self):
+        self.ops = []
+
+    def execute(self, display, target=None):
+        """ Replay the ops into target (None: the display's own frame, show() sends them) """
+        display.replay(self, target)
+
+    def diff(self, previous):
+        """ Returns (ops of this list which are not in previous, ops of previous which are not in this one),
+        ops are equal when their method and arguments are """
+        counts = {}
+        for op in previous.ops:
+            counts[op[:3]] = counts.get(op[:3], 0) + 1
+        added = []
+        for op in self.ops:
+            if counts.get(op[:3], 0):
+                counts[op[:3]] -= 1
+            else:
+                added.append(op)
+        removed = []
+        for op in reversed(previous.ops):  # the surplus copies of an op are the last ones
+            if counts.get(op[:3], 0):
+                counts[op[:3]] -= 1
+                removed.append(op)
+        removed.reverse()
+        return added, removed
+
+    @staticmethod
+    def area(ops):
+        """ Returns the bounding box [x0, y0, x1, y1] of ops, None if they painted nothing """
+        area = None
+        for op in ops:
+            box = op[3]
+            if box is None:
+                continue
+            if area is None:
+                area = list(box)
+            else:
+                area[0], area[1] = min(area[0], box[0]), min(area[1], box[1])
+                area[2], area[3] = max(area[2], box[2]), max(area[3], box[3])
+        return area
+
+
+def recorded(method):
+    """ Decorator of a MonoDisplay drawing method, a call made while a display list is recorded adds an op
+    with the area the method marked dirty """
+    def wrapper(display, *args, **kwargs):
+        box = display._record_begin()  # also counts the method as drawing, the coalesce timer waits for it
+        try:
+            return method(display, *args, **kwargs)
+        finally:
+            display._record_end(box, method.__name__, args, kwargs)
+    return wrapper
+
+
+def recorded_steps(method):
+    """ Same as recorded() for a step generator, the op is added when the generator has run """
+    def wrapper(display, *args, **kwargs):
+        if display._display_list is None:
+            return method(display, *args, **kwargs)
+        return _record_steps(display, method, args, kwargs)
+    return wrapper
+
+
+def _record_steps(display, method, args, kwargs):
+    box = display._record_begin()  # once it runs, a generator which is never run records nothing
+    try:
+        result = yield from method(display, *args, **kwargs)
+    finally:
+        display._record_end(box, method.__name__, args, kwargs)
+    return result
@@ -0,0 +1,60 @@
+import sim
+from machine import TRANSFER_US
+from mono_display import MonoDisplay
+
+
+"""
+
+1.54" e-paper startup, clear() and refresh_epaper() on the emulated SPI bus (100 kHz, the MonoDisplay default,
+and 2 MHz): RAM filled one byte per transfer and rewritten before every pass (the driver before the chunked fill)
+against the chunked fill and the inverted passes, only the bus is timed (BUSY is never raised, the panel's own
+refresh time is the same for both)
+
+"""
+
+
+def clear_per_byte(epd, color):
+    """ EPD.clear_frame_memory() as it was: a bytearray and a transfer for each of the 5000 bytes """
+    epd.set_memory_area(0, 0, epd.width - 1, epd.height - 1)
+    epd.set_memory_pointer(0, 0)
+    epd._command(0x24)  # WRITE_RAM
+    for _ in range(0, epd.width // 8 * epd.height):
+        epd._data(bytearray([color]))
+
+
+def refresh_per_byte(epd):
+    """ MonoDisplay.refresh_epaper() as it was: RAM rewritten with the color of every pass """
+    for color in (0x00, 0xff) * 2:
+        clear_per_byte(epd, color)
+        epd.display_frame()
+
+
+def clear_before(display):
+    clear_per_byte(display._display, 0xff)
+    display._frame.fill(display.UNCOLORED)
+    display._display.display_frame()
+
+
+def measure(bus, job):
+    bus.reset_stats()
+    job()
+    return bus.transfers, bus.nbytes, bus.us / 1000
+
+
+def main():
+    for rate in (100000, 2000000):
+        display = MonoDisplay(device="1in54_epd", debug=False, sck_freq=rate)
+        bus, epd = display._SPI, display._display
+        print("1.54\" e-paper, SPI {} kHz, {} us per transfer:".format(rate // 1000, TRANSFER_US))
+        rows = (("startup", lambda: (epd.init(), refresh_per_byte(epd)),
+                 lambda: MonoDisplay(device="1in54_epd", debug=False, bus=bus)),
+                ("clear()", lambda: clear_before(display), display.clear),
+                ("refresh_epaper()", lambda: refresh_per_byte(epd), display.refresh_epaper))
+        for name, before, after in rows:
+            old, new = measure(bus, before), measure(bus, after)
+            print("  {:<17} {:>5} writes {:>5} bytes {:>8.1f} ms  ->  {:>3} writes {:>5} bytes {:>7.1f} ms"
+                  .format(name, old[0], old[1], old[2], new[0], new[1], new[2]))
+
+
+if __name__ == "__main__":
+    main()
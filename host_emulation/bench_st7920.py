@@ -0,0 +1,85 @@
+import sim
+import time
+from machine import SPI, TRANSFER_US
+from st7920 import ST7920, ST7920_CMD, ST7920_DAT
+
+
+"""
+
+ST7920 full frame flush on the emulated SPI bus (100 kHz, the MonoDisplay default, and 1 MHz):
+per word (the driver's show() before GDRAM rows were buffered: 4 writes of 3 bytes per 16 px word,
+address recomputed for every word) against show() (one write per row), the decoded GDRAM images are compared
+
+"""
+
+
+FRAMES = 5
+
+
+def show_per_word(display, data):
+    """ ST7920.show() as it was: address and two data bytes of every word, each one its own transfer """
+    for i in range(0, len(data), 2):
+        x = (i // 2) % 8
+        y = i // 16
+        if i >= len(data) // 2:
+            x += 8
+            y += 32
+        display._write(ST7920_CMD, 0x80 | y)
+        display._write(ST7920_CMD, 0x80 | x)
+        display._write(ST7920_DAT, data[i])
+        display._write(ST7920_DAT, data[i+1])
+
+
+def decode(log):
+    """ GDRAM image (MONO_HLSB, 128x64) written by a logged command stream, extended instruction set """
+    stream = b"".join(log)
+    ram = bytearray(1024)
+    y = x = 0
+    y_next = True  # address commands come in pairs, vertical first
+    low_byte = False
+    for i in range(0, len(stream), 3):
+        value = stream[i + 1] | (stream[i + 2] >> 4)
+        if stream[i] == ST7920_CMD:
+            if value & 0x80:
+                if y_next:
+                    y = value & 0x1F
+                else:
+                    x = value & 0x0F
+                    low_byte = False
+                y_next = not y_next
+        else:
+            row = y + 32 if x >= 8 else y
+            ram[row * 16 + (x & 7) * 2 + low_byte] = value
+            low_byte = not low_byte
+            if not low_byte:
+                x += 1
+    return ram
+
+
+def run(name, flush, display, bus, frames):
+    bus.reset_stats()
+    bus.log_data = True
+    start = time.perf_counter()
+    for frame in frames:
+        flush(display, frame)
+    cpu_ms = (time.perf_counter() - start) * 1000 / len(frames)
+    assert decode(bus.log) == frames[-1], name + ": GDRAM image differs from the frame"
+    bus.log_data = False
+    print("  {:<10} {:>6} writes {:>6} bytes {:>9.1f} ms bus {:>7.2f} ms host CPU  per frame".format(
+        name, bus.transfers // len(frames), bus.nbytes // len(frames), bus.us / 1000 / len(frames), cpu_ms))
+    return bus.us
+
+
+def main():
+    frames = [bytearray((i * 37 + n * 11) & 0xFF for i in range(1024)) for n in range(FRAMES)]
+    for rate in (100000, 1000000):
+        bus = SPI(baudrate=rate)
+        display = ST7920(bus)
+        print("ST7920 128x64 full frame, SPI {} kHz, {} us per transfer:".format(rate // 1000, TRANSFER_US))
+        before = run("per word", show_per_word, display, bus, frames)
+        after = run("per row", lambda d, f: d.show(f, full_update=True), display, bus, frames)
+        print("  bus time {:.1f}x shorter".format(before / after))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+
+stand-in of MicroPython's framebuf: same formats, buffer layouts (rows padded to whole bytes) and drawing
+calls, pure Python and slow, text() draws a made up 8x8 glyph per char instead of the real font
+
+"""
+
+
+MONO_VLSB = 0
+RGB565 = 1
+GS4_HMSB = 2
+MONO_HLSB = 3
+MONO_HMSB = 4
+GS2_HMSB = 5
+GS8 = 6
+
+
+class FrameBuffer:
+    def __init__(self, buf, width, height, fmt, stride=None):
+        self._buf = buf
+        self._w = width
+        self._h = height
+        self._fmt = fmt
+        stride = stride or width
+        if fmt in (MONO_HLSB, MONO_HMSB):
+            stride = (stride + 7) & ~7
+        elif fmt == GS2_HMSB:
+            stride = (stride + 3) & ~3
+        elif fmt == GS4_HMSB:
+            stride = (stride + 1) & ~1
+        self._stride = stride
+
+    def _set(self, x, y, c):
+        if not (0 <= x < self._w and 0 <= y < self._h):
+            return
+        b, s, fmt = self._buf, self._stride, self._fmt
+        if fmt == MONO_VLSB:
+            i, m = (y >> 3) * s + x, 1 << (y & 7)
+        elif fmt == MONO_HLSB:
+            i, m = (y * s + x) >> 3, 0x80 >> (x & 7)
+        elif fmt == MONO_HMSB:
+            i, m = (y * s + x) >> 3, 1 << (x & 7)
+        elif fmt == RGB565:
+            i = (y * s + x) * 2
+            b[i], b[i + 1] = c & 0xFF, (c >> 8) & 0xFF
+            return
+        elif fmt == GS4_HMSB:
+            i = (y * s + x) >> 1
+            b[i] = (b[i] & 0xF0) | (c & 0x0F) if x & 1 else (b[i] & 0x0F) | ((c & 0x0F) << 4)
+            return
+        elif fmt == GS2_HMSB:
+            i, shift = (y * s + x) >> 2, (x & 3) * 2
+            b[i] = (b[i] & ~(3 << shift)) | ((c & 3) << shift)
+            return
+        else:
+            b[y * s + x] = c & 0xFF
+            return
+        b[i] = b[i] | m if c else b[i] & ~m
+
+    def _get(self, x, y):
+        b, s, fmt = self._buf, self._stride, self._fmt
+        if fmt == MONO_VLSB:
+            return (b[(y >> 3) * s + x] >> (y & 7)) & 1
+        elif fmt == MONO_HLSB:
+            return (b[(y * s + x) >> 3] >> (7 - (x & 7))) & 1
+        elif fmt == MONO_HMSB:
+            return (b[(y * s + x) >> 3] >> (x & 7)) & 1
+        elif fmt == RGB565:
+            i = (y * s + x) * 2
+            return b[i] | (b[i + 1] << 8)
+        elif fmt == GS4_HMSB:
+            i = (y * s + x) >> 1
+            return b[i] & 0x0F if x & 1 else b[i] >> 4
+        elif fmt == GS2_HMSB:
+            return (b[(y * s + x) >> 2] >> ((x & 3) * 2)) & 3
+        return b[y * s + x]
+
+    def pixel(self, x, y, c=None):
+        x, y = int(x), int(y)
+        if c is None:
+            if 0 <= x < self._w and 0 <= y < self._h:
+                return self._get(x, y)
+            return None
+        self._set(x, y, c)
+
+    def fill(self, c):
+        self.fill_rect(0, 0, self._w, self._h, c)
+
+    def fill_rect(self, x, y, w, h, c):
+        x0, y0 = max(0, int(x)), max(0, int(y))
+        x1, y1 = min(self._w, int(x + w)), min(self._h, int(y + h))
+        for yy in range(y0, y1):
+            for xx in range(x0, x1):
+                self._set(xx, yy, c)
+
+    def hline(self, x, y, w, c):
+        self.fill_rect(x, y, w, 1, c)
+
+    def vline(self, x, y, h, c):
+        self.fill_rect(x, y, 1, h, c)
+
+    def rect(self, x, y, w, h, c, f=False):
+        if f:
+            self.fill_rect(x, y, w, h, c)
+            return
+        self.hline(x, y, w, c)
+        self.hline(x, y + h - 1, w, c)
+        self.vline(x, y, h, c)
+        self.vline(x + w - 1, y, h, c)
+
+    def line(self, x1, y1, x2, y2, c):
+        x1, y1, x2, y2 = int(x1), int(y1), int(x2), int(y2)
+        n = max(abs(x2 - x1), abs(y2 - y1), 1)
+        for i in range(n + 1):
+            self._set(x1 + round((x2 - x1) * i / n), y1 + round((y2 - y1) * i / n), c)
+
+    def text(self, s, x, y, c=1):
+        for k, ch in enumerate(s):
+            if ch == ' ':
+                continue
+            o = ord(ch)
+            for r in range(8):
+                for q in range(8):
+                    if (o * 7 + r * 3 + q) % 5 < 2:
+                        self._set(x + k * 8 + q, y + r, c)
+
+    def blit(self, fbuf, x, y, key=-1, palette=None):
+        for yy in range(fbuf._h):
+            for xx in range(fbuf._w):
+                c = fbuf._get(xx, yy)
+                if palette is not None:
+                    c = palette._get(c, 0)
+                if c != key:
+                    self._set(x + xx, y + yy, c)
+
+    def scroll(self, xstep, ystep):
+        pixels = [[self._get(x, y) for x in range(self._w)] for y in range(self._h)]
+        for y in range(self._h):
+            for x in range(self._w):
+                sx, sy = x - xstep, y - ystep
+                if 0 <= sx < self._w and 0 <= sy < self._h:
+                    self._set(x, y, pixels[sy][sx])
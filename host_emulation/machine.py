@@ -0,0 +1,157 @@
+import sim
+
+
+"""
+
+stand-ins of the machine classes mono_display and the drivers use, buses log their transfers and take
+simulated time: TRANSFER_US per write plus the bits at the bus clock
+
+"""
+
+
+TRANSFER_US = 25  # call and CS/DC handling cost of one bus write (ESP32 class MCU, MicroPython)
+
+
+class Pin:
+    OUT = 1
+    IN = 0
+    PULL_UP = 2
+    PULL_DOWN = 3
+    IRQ_FALLING = 4
+    IRQ_RISING = 8
+
+    def __init__(self, n, mode=None, pull=None, value=None):
+        self.n = n
+        self._value = value or 0
+        self._handler = None
+        self._trigger = 0
+
+    def init(self, mode=None, value=None, pull=None):
+        if value is not None:
+            self._value = value
+
+    def value(self, v=None):
+        if v is None:
+            return self._value
+        self._value = v
+
+    def __call__(self, v=None):
+        return self.value(v)
+
+    def on(self):
+        self._value = 1
+
+    def off(self):
+        self._value = 0
+
+    def irq(self, handler=None, trigger=IRQ_FALLING | IRQ_RISING):
+        self._handler = handler
+        self._trigger = trigger
+
+    def drive(self, v):
+        """ The other side (a panel) sets the level, an armed IRQ of the edge runs """
+        if v == self._value:
+            return
+        self._value = v
+        edge = Pin.IRQ_RISING if v else Pin.IRQ_FALLING
+        if self._handler is not None and self._trigger & edge:
+            self._handler(self)
+
+
+class Bus:
+    def __init__(self, *args, baudrate=None, freq=None, **kwargs):
+        self.rate = baudrate or freq or 1000000
+        self.log = []  # bytes of every transfer, when log_data is set
+        self.log_data = False
+        self.transfers = 0
+        self.nbytes = 0
+        self.us = 0  # simulated time spent on the bus
+
+    def init(self, *args, baudrate=None, **kwargs):
+        if baudrate:
+            self.rate = baudrate
+
+    def reset_stats(self):
+        self.log = []
+        self.transfers = 0
+        self.nbytes = 0
+        self.us = 0
+
+    def _transfer(self, n):
+        us = TRANSFER_US + n * 8 * 1000000 // self.rate
+        self.transfers += 1
+        self.nbytes += n
+        self.us += us
+        sim.advance(us)
+
+    def write(self, buf):
+        if self.log_data:
+            self.log.append(bytes(buf))
+        self._transfer(len(buf))
+
+    def scan(self):
+        return [0x3c]
+
+    def writeto(self, addr, buf, stop=True):
+        self.write(buf)
+
+    def writevto(self, addr, bufs, stop=True):
+        if self.log_data:
+            self.log.append(b"".join(bytes(b) for b in bufs))
+        self._transfer(sum(len(b) for b in bufs))
+
+
+class SPI(Bus):
+    pass
+
+
+class SoftSPI(Bus):
+    pass
+
+
+class I2C(Bus):
+    pass
+
+
+class SoftI2C(Bus):
+    pass
+
+
+class PWM:
+    def __init__(self, pin, freq=0, duty=0):
+        self._duty = duty
+
+    def duty(self, v=None):
+        if v is None:
+            return self._duty
+        self._duty = v
+
+    def deinit(self):
+        pass
+
+
+class RTC:
+    def datetime(self, dt=None):
+        return (2026, 10, 18, 6, 12, 0, 0, 0)
+
+
+class Timer:
+    """ One-shot/periodic timer on the simulated clock, the callback runs when the clock passes the period """
+    ONE_SHOT = 0
+    PERIODIC = 1
+
+    def __init__(self, id=-1):
+        self._event = None
+
+    def init(self, mode=PERIODIC, period=-1, callback=None):
+        self.deinit()
+
+        def fire():
+            self._event = sim.at(period * 1000, fire) if mode == Timer.PERIODIC else None
+            callback(self)
+        self._event = sim.at(period * 1000, fire)
+
+    def deinit(self):
+        if self._event is not None:
+            sim.cancel(self._event)
+            self._event = None
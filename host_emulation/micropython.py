@@ -0,0 +1,13 @@
+from sim import schedule
+
+
+def const(x):
+    return x
+
+
+def native(f):
+    return f
+
+
+def viper(f):
+    return f
@@ -0,0 +1,102 @@
+import os
+import sys
+import time
+
+
+"""
+
+2026-10-18: host emulation -> runs mono_display and the drivers on CPython with the stand-in machine, framebuf,
+            micropython and utime modules of this folder, time is a simulated clock: sleeps and bus transfers
+            advance it, panel events (BUSY pin edges, timers) run when it passes them
+
+usage: python host_emulation/<script>.py from the repo root (or anywhere), import sim before anything else
+
+"""
+
+
+_here = os.path.dirname(os.path.abspath(__file__))
+_root = os.path.dirname(_here)
+sys.path[:0] = [_here, _root, os.path.join(_root, "display_drivers")]
+
+now_us = 0  # simulated clock
+_events = []  # [time_us, seq, fn, cancelled], kept sorted
+_seq = 0
+_scheduled = []  # micropython.schedule() callbacks, run at the next clock step
+
+
+def at(delay_us, fn):
+    """ Run fn() once the clock has advanced by delay_us, returns the event (cancel() takes it back) """
+    global _seq
+    _seq += 1
+    event = [now_us + delay_us, _seq, fn, False]
+    _events.append(event)
+    _events.sort()
+    return event
+
+
+def cancel(event):
+    event[3] = True
+
+
+def schedule(fn, arg):
+    _scheduled.append((fn, arg))
+
+
+def run_scheduled():
+    while _scheduled:
+        fn, arg = _scheduled.pop(0)
+        fn(arg)
+
+
+def advance(us):
+    """ Move the clock forward, running the events due meanwhile and the callbacks they schedule """
+    global now_us
+    end = now_us + us
+    while _events and _events[0][0] <= end:
+        event = _events.pop(0)
+        now_us = max(now_us, event[0])
+        if not event[3]:
+            event[2]()
+        run_scheduled()
+    now_us = end
+    run_scheduled()
+
+
+def reset():
+    global now_us
+    now_us = 0
+    del _events[:]
+    del _scheduled[:]
+
+
+def sleep_ms(ms):
+    advance(int(ms * 1000))
+
+
+def sleep_us(us):
+    advance(int(us))
+
+
+def ticks_ms():
+    return now_us // 1000
+
+
+def ticks_us():
+    return now_us
+
+
+def ticks_diff(a, b):
+    return a - b
+
+
+def ticks_add(a, b):
+    return a + b
+
+
+# drivers import sleep_ms & co. from time too (MicroPython has them there)
+time.sleep_ms = sleep_ms
+time.sleep_us = sleep_us
+time.ticks_ms = ticks_ms
+time.ticks_us = ticks_us
+time.ticks_diff = ticks_diff
+time.ticks_add = ticks_add
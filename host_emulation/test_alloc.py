@@ -0,0 +1,95 @@
+import sim
+import tracemalloc
+from machine import Pin
+
+
+"""
+
+heap allocations of the driver flush paths in steady state (PCD8544, SH1106), measured with tracemalloc (CPython objects stand in
+for MicroPython heap blocks): the traced memory must not rise above where it was before the flushes, not even for a
+moment, the bus and pins are stand-ins which allocate nothing themselves
+
+run: python host_emulation/test_alloc.py (or pytest host_emulation)
+
+"""
+
+
+FLUSHES = 50
+
+
+class NullBus:
+    """ SPI/I2C stand-in taking the buffers without looking at them """
+    def write(self, buf):
+        pass
+
+    def writeto(self, addr, buf, stop=True):
+        pass
+
+    def writevto(self, addr, bufs, stop=True):
+        pass
+
+
+def peak_alloc(flush):
+    """ Bytes traced above the starting point at the peak of FLUSHES calls of flush() (after a warm up call),
+    measured twice and the second taken: CPython allocates for itself the first time a call site runs traced
+    (frame stack, specialized bytecode), a flush that allocates does it every time """
+    flush()
+    passes = iter(range(2))
+    calls = [iter(range(FLUSHES)), iter(range(FLUSHES))]
+    tracemalloc.start()
+    try:
+        for n in passes:
+            base = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            for _ in calls[n]:
+                flush()
+            peak = tracemalloc.get_traced_memory()[1] - base
+        return peak
+    finally:
+        tracemalloc.stop()
+
+
+def _range_loop():
+    for _ in range(6):
+        pass
+
+
+# CPython allocates the iterator of a for ... in range() loop, MicroPython compiles it to a counter
+RANGE_LOOP = peak_alloc(_range_loop)
+
+
+def test_pcd8544_flush():
+    from pcd8544 import PCD8544
+    display = PCD8544(NullBus(), Pin(1), Pin(2), Pin(3))
+    framedata = memoryview(bytearray(84 * 48 // 8))
+    banks = [framedata[bank * 84:(bank + 1) * 84] for bank in range(6)]  # what MonoDisplay slices on show()
+
+    def flush():
+        bank = 0
+        while bank < 6:
+            display.position(0, bank)
+            display.data(banks[bank])
+            bank += 1
+
+    assert peak_alloc(flush) == 0
+    assert peak_alloc(display.clear) <= RANGE_LOOP
+    assert peak_alloc(lambda: display.cmd(0x0c)) == 0
+
+
+def test_sh1106_flush():
+    from sh1106 import SH1106_I2C
+    display = SH1106_I2C(128, 64, NullBus(), rotate=0, delay=0)
+
+    def flush():
+        display.register_updates(20, 27, 40, 55)  # what fill_rect() of a widget redrawn in place marks
+        display.show()
+
+    assert peak_alloc(flush) <= RANGE_LOOP
+    assert peak_alloc(lambda: display.show(True)) <= RANGE_LOOP
+
+
+if __name__ == "__main__":
+    for name, test in sorted(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(name, "ok")
@@ -0,0 +1,103 @@
+import sim
+import asyncio
+import mono_display_async
+from mono_display import MonoDisplay
+from mono_display_async import AsyncMonoDisplay
+
+
+"""
+
+update coalescer on the simulated clock: the pending frame goes out when it's due without anyone calling
+flush_pending() (one-shot Timer, or a task on AsyncMonoDisplay), a show() after a quiet period goes out at once,
+e-paper clear() counts toward the per-minute cap
+
+run: python host_emulation/test_coalesce.py (or pytest host_emulation)
+
+"""
+
+
+QUIET_MS = 1000
+
+
+def make(cls=MonoDisplay, device="ssd1306_128x64", **kwargs):
+    sim.reset()
+    display = cls(device=device, debug=False, coalesce=True, coalesce_quiet_ms=QUIET_MS, **kwargs)
+    sent = []
+    flush = display._flush_frame_steps
+
+    def spy(full_update=False):
+        sent.append(sim.ticks_ms())
+        return flush(full_update)
+    display._flush_frame_steps = spy
+    return display, sent
+
+
+def test_show_after_quiet_period_goes_out_at_once():
+    display, sent = make()
+    sim.sleep_ms(QUIET_MS)
+    start = sim.ticks_ms()
+    display.show()
+    assert sent == [start]
+
+
+def test_timer_sends_the_pending_frame():
+    display, sent = make()
+    display.show()
+    del sent[:]
+    sim.sleep_ms(100)
+    last = sim.ticks_ms()
+    display.show()  # within the quiet period
+    assert not sent
+    sim.sleep_ms(QUIET_MS + 50)  # no flush_pending() call
+    assert len(sent) == 1 and 0 <= sent[0] - (last + QUIET_MS) <= 5
+
+
+def test_epd_slow_mode_show_is_sent():
+    sim.reset()
+    display = MonoDisplay(device="1in54_epd", debug=False, epd_slow_mode=True)
+    for _ in range(3):
+        display.draw_rssi(10, 10, -50)
+        display.show()
+        sim.sleep_ms(100)
+    sim.sleep_ms(6000)
+    assert display._pending_since is None, "slow mode frame never sent"
+
+
+def test_epd_clear_counts_toward_the_cap():
+    sim.reset()
+    display = MonoDisplay(device="1in54_epd", debug=False, coalesce=True, coalesce_per_min=2)
+    del display._flush_times[:]
+    display.clear()
+    display.clear()
+    assert len(display._flush_times) == 2
+    sim.sleep_ms(QUIET_MS * 2)
+    display.show()
+    assert display._pending_since is not None, "frame sent over the per-minute cap"
+
+
+def test_async_task_sends_the_pending_frame():
+    async def sleep_ms(ms):
+        sim.sleep_ms(ms)
+        await asyncio.sleep(0)
+    mono_display_async._sleep_ms, restore = sleep_ms, mono_display_async._sleep_ms
+
+    async def main():
+        display, sent = make(AsyncMonoDisplay)
+        await display.show()
+        del sent[:]
+        await display.show()
+        assert not sent
+        while display._coalesce_task is not None:
+            await asyncio.sleep(0)
+        assert len(sent) == 1
+    try:
+        asyncio.run(main())
+    finally:
+        mono_display_async._sleep_ms = restore
+
+
+if __name__ == "__main__":
+    for name, test in sorted(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(name, "ok")
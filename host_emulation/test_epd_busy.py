@@ -0,0 +1,117 @@
+import sim
+from mono_display import MonoDisplay
+
+
+"""
+
+1.54" e-paper refresh completion from the BUSY pin on a simulated timeline: a stand-in panel raises BUSY a moment
+after MASTER_ACTIVATION and drops it when the refresh is over (full and partial waveforms take different times),
+the falling edge IRQ, the scheduled completion callback and the queued show() of the nonblocking mode are checked
+against it
+
+run: python host_emulation/test_epd_busy.py (or pytest host_emulation)
+
+"""
+
+
+RISE_US = 400  # activation -> BUSY high
+FULL_MS = 1200
+PARTIAL_MS = 300
+
+
+class Panel:
+    """ Drives the BUSY pin of an EPD like the controller does, logs (start, end) ms of every refresh """
+    def __init__(self, epd):
+        self.epd = epd
+        self.refreshes = []
+        command = epd._command
+
+        def spy(cmd, data=None):
+            command(cmd, data)
+            if cmd == 0x20:  # MASTER_ACTIVATION
+                self.activate()
+        epd._command = spy
+
+    def activate(self):
+        assert not self.epd.busy.value(), "refresh started while the panel was busy"
+        ms = PARTIAL_MS if self.epd._partial_lut else FULL_MS
+        start = sim.now_us + RISE_US
+        self.refreshes.append((start // 1000, (start + ms * 1000) // 1000))
+        sim.at(RISE_US, lambda: self.epd.busy.drive(1))
+        sim.at(RISE_US + ms * 1000, lambda: self.epd.busy.drive(0))
+
+
+def make(**kwargs):
+    sim.reset()
+    display = MonoDisplay(device="1in54_epd", debug=False, sck_freq=2000000, **kwargs)
+    return display, Panel(display._display)
+
+
+def test_callback_waits_for_the_refresh():
+    display, panel = make()
+    done = []
+    display._display.display_frame(callback=lambda _: done.append(sim.ticks_ms()))
+    sim.run_scheduled()
+    assert not done, "completion was scheduled before BUSY rose"
+    sim.sleep_ms(FULL_MS - 10)
+    assert not done
+    sim.sleep_ms(20)
+    assert done == [panel.refreshes[0][1]]
+
+
+def test_fast_refresh_still_completes():
+    display, panel = make()
+    epd = display._display
+    done = []
+    epd._command(0x22)
+    epd._command(0x20)
+    sim.sleep_ms(FULL_MS + 1)  # over before the callback is armed
+    epd.on_idle(lambda _: done.append(sim.ticks_ms()))
+    sim.run_scheduled()
+    assert len(done) == 1
+
+
+def test_blocking_refresh_overshoot():
+    display, panel = make(epd_partial=True)
+    epd = display._display
+    idle_seen = []
+    is_busy = epd.is_busy
+
+    def spy():
+        busy = is_busy()
+        if not busy and not idle_seen:
+            idle_seen.append(sim.ticks_ms())
+        return busy
+    epd.is_busy = spy
+    display.draw_rssi(10, 10, -50)
+    display.show()
+    assert 0 <= idle_seen[0] - panel.refreshes[-1][1] <= 20  # adaptive poll, was up to 100 ms
+
+
+def test_nonblocking_show_queues_the_newest_frame():
+    display, panel = make(epd_partial=True, epd_nonblocking=True)
+    display.show()  # whole frame once
+    display.wait_flush()
+    del panel.refreshes[:]
+    display.draw_rssi(10, 10, -50)
+    before = sim.ticks_ms()
+    display.show()
+    assert sim.ticks_ms() - before < 5, "show() waited for the refresh"
+    assert display._epd_busy and len(panel.refreshes) == 1
+    for state in (-90, -70, -40):  # while the first refresh runs
+        sim.sleep_ms(50)
+        display.draw_rssi(10, 10, state)
+        display.show()
+    assert len(panel.refreshes) == 1 and display._epd_queued is not None
+    display.wait_flush()
+    assert len(panel.refreshes) == 2, "the three frames went out as one"
+    assert panel.refreshes[1][0] >= panel.refreshes[0][1], "queued frame started during the first refresh"
+    assert 0 <= sim.ticks_ms() - panel.refreshes[1][1] <= 20
+    assert not display._epd_busy and display._epd_queued is None
+
+
+if __name__ == "__main__":
+    for name, test in sorted(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(name, "ok")
@@ -0,0 +1,5 @@
+from sim import sleep_ms, sleep_us, ticks_ms, ticks_us, ticks_diff, ticks_add
+
+
+def sleep(s):
+    sleep_ms(s * 1000)
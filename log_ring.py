@@ -0,0 +1,73 @@
+from array import array
+
+
+"""
+
+2026-10-18: LogRing -> log history in one preallocated bytearray arena, an offset/length index ring points at the
+            lines, append() is O(1) and keeps no object per line, the oldest lines make room for the new ones,
+            lines are read as memoryviews of the arena
+
+"""
+
+
+class LogRing:
+    def __init__(self, max_lines, arena_bytes):
+        self._arena = bytearray(max(1, arena_bytes))
+        self._view = memoryview(self._arena)
+        typecode, itemsize = ('H', 2) if len(self._arena) <= 0xFFFF else ('I', 4)
+        self._start = array(typecode, bytearray(max_lines * itemsize))  # zeroed, a bytearray is taken as raw data
+        self._length = array(typecode, bytearray(max_lines * itemsize))
+        self.max_lines = max_lines
+        self._first = 0  # index slot of the oldest line
+        self._count = 0
+        self._head = 0  # arena offset the next line is written at
+
+    def __len__(self):
+        return self._count
+
+    def _drop_oldest(self):
+        self._first = (self._first + 1) % self.max_lines
+        self._count -= 1
+
+    def append(self, text):
+        """ Store a line (str or bytes, cut to the arena size), dropping the oldest lines it needs room from """
+        data = text.encode() if isinstance(text, str) else text
+        size = len(self._arena)
+        n = min(len(data), size)
+        pos = self._head
+        if pos + n > size:
+            # the arena end is skipped, the lines still stored there are the oldest ones
+            while self._count and self._start[self._first] >= pos:
+                self._drop_oldest()
+            pos = 0
+        while self._count:
+            start = self._start[self._first]
+            end = start + max(1, self._length[self._first])  # an empty line counts as 1 byte, newer ones are behind it
+            if self._count < self.max_lines and not (start < pos + n and pos < end):
+                break
+            self._drop_oldest()
+        self._arena[pos:pos + n] = data[:n]
+        slot = (self._first + self._count) % self.max_lines
+        self._start[slot] = pos
+        self._length[slot] = n
+        self._count += 1
+        self._head = pos + n
+
+    def line(self, i):
+        """ Returns line i (0 is the oldest, negative ones count from the newest) as a memoryview of the arena """
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError("log line out of range")
+        slot = (self._first + i) % self.max_lines
+        start = self._start[slot]
+        return self._view[start:start + self._length[slot]]
+
+    def lines(self, start, stop):
+        """ Returns the lines start..stop - 1 (clipped to the stored ones) as memoryviews """
+        return [self.line(i) for i in range(max(0, start), min(stop, self._count))]
+
+    def clear(self):
+        self._first = 0
+        self._count = 0
+        self._head = 0
@@ -1,12 +1,65 @@
-from machine import Pin, SoftSPI, SoftI2C, PWM
+from machine import Pin, SPI, I2C, SoftSPI, SoftI2C, PWM, Timer
+from micropython import schedule
 import consts_mono_display
 import framebuf
-from utime import sleep_ms
+from display_list import DisplayList, recorded, recorded_steps
+from log_ring import LogRing
+from utime import sleep_ms, ticks_ms, ticks_us, ticks_diff
 from math import sin, cos, pi
 
 
 """
 
+2026-10-18: log_history=n, log_arena_bytes=n -> log() lines are kept in a LogRing (log_ring.py): one preallocated
+            bytearray arena and an offset/length index ring instead of two lists trimmed with pop(0), appends are
+            O(1), the history (default: 8 screens with scrollable_log, else one) goes into the thousands of lines,
+            log() and show_scrollable_log() read the lines as memoryviews and decode only the ones drawn
+2026-10-18: text_cache_bytes=n -> log(), show_scrollable_log() and draw_str() blit their lines from a cache of rendered
+            strips keyed by (text, color, format) with the center/right offsets, LRU within n bytes,
+            ->get_text_cache_hit_rate()
+2026-10-18: sprite_cache_bytes=n -> draw_battery_state() (not charging), draw_rssi() and draw_switch() render each
+            state bucket once into a framebuf of the frame's format (sprite_cache.py, LRU within n bytes), a redraw
+            is one blit, the background of battery and rssi sprites is left out
+2026-10-18: ->begin_display_list(), ->end_display_list(), ->replay(display_list, target=None): trace, draw_circle,
+            draw_switch, draw_battery_state, draw_rssi, progressbar, draw_str and draw_save_glyph calls are recorded
+            as op records with their bounding box into a DisplayList (display_list.py), which can be executed into
+            any framebuf and diffed against another one
+2026-10-18: render_scale=2 -> st7735_1in44/gc9a01 RGB565 frame is drawn at half resolution (scaled_frame.py), show()
+            doubles its rows and columns into a reused line buffer while streaming, coordinates stay in screen
+            pixels, text and the save glyph are drawn twice as big (log() has W//16 chars and H//16 lines)
+2026-10-18: tft_band_rows=n -> st7735_1in44/gc9a01 RGB565 frame is recorded from the drawing calls (banded_frame.py)
+            and rendered into a buffer of n rows band by band while show() streams the dirty window
+            (7.7 KB instead of 115 KB on the gc9a01 with n=16), shadow_flush and pipelined are not used with it
+2026-10-18: tft_indexed=True -> colored st7735_1in44/gc9a01 keep a GS4_HMSB (GS2 up to 4 colors) framebuffer of theme
+            palette indices, show() expands them to RGB565 through the palette LUT, ->set_theme(theme) swaps colors
+            without a redraw
+2026-10-18: tft_mono=True -> st7735_1in44/gc9a01 without tft_colored keep a 1 bit MONO_HLSB framebuffer (2 KB/7.2 KB
+            instead of 32 KB/115 KB), show() expands it to RGB565 through a byte LUT into a reused line buffer
+2026-10-18: sh1106 driver tracks the changed columns of each page too (pixel, text, line, hline, vline, fill_rect,
+            rect, blit), show() sends only that slice of the page, rotate90 remaps only the changed area
+2026-10-18: ssd1306 driver tracks the changed columns of each page from its framebuf methods, show() narrows
+            SET_COL_ADDR/SET_PAGE_ADDR to them, ssd1309_driver="ssd1306" runs the ssd1309 on it (default "sh1106")
+2026-10-18: coalesce=True -> show() (and every drawing method that shows) only marks the frame pending, it's sent
+            at once after coalesce_quiet_ms without requests, else coalesce_quiet_ms after the last request or
+            coalesce_stale_ms after the first one, at most coalesce_per_min times a minute (e-paper clear() counts),
+            a one-shot machine.Timer(coalesce_timer_id) sends it when it's due (AsyncMonoDisplay: a task),
+            flush_pending() still does it from a loop, epd_slow_mode=True turns it on
+2026-10-18: epd_nonblocking=True -> e-paper show() returns once RAM is written, the BUSY pin IRQ finishes the refresh,
+            a show() during a refresh queues a frozen copy of the frame (newest wins), wait_flush() waits for both
+2026-10-18: e-paper busy waits poll adaptively (1..20 ms) instead of every 100 ms
+2026-10-18: epd_partial=True -> e-paper show() uses the partial (differential) waveform on the changed window,
+            a full refresh is forced after epd_full_every partial updates or epd_full_after_s seconds
+2026-10-18: e-paper RAM fill is chunked, refresh_epaper() writes RAM once and alternates the passes by inverting it
+2026-10-18: nokia_5110 tracks the changed column range of each 8 px bank, show() sends only those spans
+2026-10-18: st7920_text_mode=True -> log(), log_rtc() and show_scrollable_log() write the ST7920's CGROM text
+            (DDRAM, 4 lines of 16 chars, 8x16 font) instead of rendering into GDRAM, graphics are overlaid
+2026-10-18: hw_bus=True -> hardware SPI(bus_id)/I2C(bus_id) with soft bus fallback, bus=<object> reuses a caller's
+            bus, chunk_size limits bytes per bus write, get_par() reports the bus backend and its bytes/sec
+2026-10-18: pipelined=True -> show() hands a copy of the frame to a flusher thread (_thread), drawing goes on,
+            drop_stale=True skips frames while the flusher is busy, wait_flush() blocks until it's done
+2026-10-18: blocking methods run as step generators, AsyncMonoDisplay (mono_display_async.py) awaits them
+2026-10-18: shadow_flush=True -> show() compares the frame with the last sent one and sends only the changed spans
+2026-10-18: show() sends only the dirty rectangle collected by the drawing methods (show(full_update=True) for all)
 2025-04-20: works with GC9A01 round TFT (really slowly)
 2025-04-11: ->draw_str(x, y, text="n/a", blit=False), partly fixed drawing errors when screen is inverted, inverted
             mode is not implemented for st7735
@@ -74,7 +127,33 @@ class MonoDisplay:
                  up_button_pin=False,
                  down_button_pin=False,
                  epd_slow_mode=False,
-                 tft_colored=False):
+                 tft_colored=False,
+                 shadow_flush=False,
+                 pipelined=False,
+                 drop_stale=False,
+                 hw_bus=False,
+                 bus_id=1,
+                 bus=None,
+                 chunk_size=4096,
+                 st7920_text_mode=False,
+                 epd_partial=False,
+                 epd_full_every=20,
+                 epd_full_after_s=600,
+                 epd_nonblocking=False,
+                 coalesce=False,
+                 coalesce_quiet_ms=1000,
+                 coalesce_stale_ms=5000,
+                 coalesce_per_min=12,
+                 coalesce_timer_id=0,
+                 ssd1309_driver="sh1106",
+                 tft_mono=False,
+                 tft_indexed=False,
+                 tft_band_rows=0,
+                 render_scale=1,
+                 sprite_cache_bytes=0,
+                 text_cache_bytes=0,
+                 log_history=0,
+                 log_arena_bytes=0):
 
         # --------  CONTROL VARS  --------
         self.DEBUG = debug
@@ -83,9 +162,56 @@ class MonoDisplay:
         self._device = device.lower()
         self.backlight = backlight
         self._epd_mem_clear = [0x00, 0xff] * 2  # used only with e-ink device
+        self._epd_partial = epd_partial  # ghosting governor: full refresh after n partial ones or t seconds
+        self._epd_full_every = epd_full_every
+        self._epd_full_after_ms = epd_full_after_s * 1000
+        self._epd_partial_count = 0
+        self._epd_last_full = ticks_ms()
+        self._epd_nonblocking = epd_nonblocking and self._device == "1in54_epd"
+        self._epd_busy = False  # refresh in flight (nonblocking mode)
+        self._epd_queued = None  # [bounds, full_update] of the frame waiting in _epd_queue_buf
+        self._epd_queuing = False  # show() is updating the queue, the IRQ callback keeps off
+        self._epd_shown = None  # window of the refresh in flight, copied to the previous image RAM when it's done
+        # update coalescer for slow panels, see flush_pending():
+        self._coalesce = coalesce or (epd_slow_mode and self._device == "1in54_epd")
+        self._coalesce_quiet_ms = coalesce_quiet_ms
+        self._coalesce_stale_ms = coalesce_stale_ms
+        self._coalesce_per_min = coalesce_per_min
+        self._pending_since = None  # time of the first show() request not sent yet
+        self._last_request = None
+        self._flush_times = []  # times of the coalesced flushes in the last minute
+        self._coalesce_timer_id = coalesce_timer_id
+        self._coalesce_timer = None  # one-shot Timer of the pending frame, made on first use
+        self._coalesce_irq_cb = self._coalesce_irq  # bound once, the timer IRQ must not allocate
+        self._coalesce_due_cb = self._coalesce_due
+        self._drawing = 0  # drawing methods running, the timer doesn't send a frame they're halfway through
         self._last_oled_brightness = 0
         self._scrollable_log = scrollable_log
         self.spcr = "\t-> "
+        self._flush_chunk = chunk_size  # max bytes per bus write while streaming the framebuffer
+        self._hw_bus = hw_bus
+        self._bus_id = bus_id
+        self._bus_backend = ""
+        self._bus_bytes = 0  # framebuffer bytes sent and the time spent on sending them, see get_par()
+        self._bus_us = 0
+        self._pipelined = False  # set at the end of init, once the flusher thread can take frames
+        self._tft_lut = None  # TFT with an indexed framebuffer: pixel byte -> RGB565 pixels
+        self._theme = consts_mono_display.tft_color_theme  # color of a theme name (palette index if tft_indexed)
+        self._theme_names = None  # palette order of the theme names (tft_indexed)
+        self._tft_banded = False  # TFT frame is rendered band by band from the recorded drawing calls
+        self._render_scale = 1  # TFT frame is drawn at 1/n resolution and upscaled on show()
+        self._display_list = None  # DisplayList the widget calls are recorded into
+        self._sprites = None  # SpriteCache of the widgets (sprite_cache_bytes), set once the frame is known
+        self._text_lines = None  # SpriteCache of rendered text lines (text_cache_bytes)
+        self._op_box = None  # area marked dirty by the widget call being recorded
+        self._replaying = False  # a display list is executed: the frame is drawn, the screen is left alone
+        # page addressed OLED driver behind the device: "sh1106", "ssd1306" or None
+        if self._device == "sh1106_128x64" or (self._device == "ssd1309_128x64" and ssd1309_driver == "sh1106"):
+            self._oled_driver = "sh1106"
+        elif self._device == "ssd1306_128x64" or self._device == "ssd1309_128x64":
+            self._oled_driver = "ssd1306"
+        else:
+            self._oled_driver = None
 
         # -> init the right driver by given key:
         self._devices_dict = consts_mono_display.display_properties
@@ -102,7 +228,7 @@ class MonoDisplay:
         if self._device == "sh1106_128x64" or self._device == "ssd1306_128x64" or self._device == "ssd1309_128x64":
             self._i2c_scl = Pin(scl)
             self._i2c_sda = Pin(sda)
-            self._i2c = SoftI2C(scl=self._i2c_scl, sda=self._i2c_sda, freq=self._sck_freq)
+            self._i2c = self._make_bus(bus, I2C, SoftI2C, scl=self._i2c_scl, sda=self._i2c_sda, freq=self._sck_freq)
             if self.DEBUG:
                 i2c_scan_result = self._i2c.scan()
                 if len(i2c_scan_result) > 0:
@@ -118,17 +244,17 @@ class MonoDisplay:
             self._dc = Pin(dc, Pin.OUT)
             self._rst = Pin(rst, Pin.OUT)
             self._busy = Pin(busy, Pin.OUT)
-            self._epd_slow_mode = epd_slow_mode
             self._tft_colored = tft_colored
-            self._SPI = SoftSPI(baudrate=self._sck_freq,
-                                polarity=0,
-                                phase=0,
-                                sck=self._sck,
-                                mosi=self._mosi,
-                                miso=self._miso)
+            self._SPI = self._make_bus(bus, SPI, SoftSPI,
+                                       baudrate=self._sck_freq,
+                                       polarity=0,
+                                       phase=0,
+                                       sck=self._sck,
+                                       mosi=self._mosi,
+                                       miso=self._miso)
 
             if self.DEBUG:
-                print(self.spcr + "init SPI OK")
+                print(self.spcr + "init SPI OK ({backend})".format(backend=self._bus_backend))
         # --------  INIT BUS END  --------
 
         # --------  INIT DISPLAY & CONSTRUCT SCREEN  --------
@@ -168,19 +294,19 @@ class MonoDisplay:
                 elif self._device == "sh1106_128x64":
                     import sh1106
                     self._display = sh1106.SH1106_I2C(self.W, self.H, self._i2c, rotate=0, delay=0)
-                    self._framedata = bytearray(self.W * self.H // 8)
+                    self._framedata = self._display.renderbuf  # drawn by the driver itself
                     self._frame = self._display  # note this is inherited from framebuf
 
-                elif self._device == "ssd1309_128x64":
+                elif self._device == "ssd1309_128x64" and self._oled_driver == "sh1106":
                     import sh1106
                     self._display = sh1106.SH1106_I2C(self.W + 2, self.H, self._i2c, rotate=0, delay=0)
-                    self._framedata = bytearray(self.W * self.H // 8)
+                    self._framedata = self._display.renderbuf  # drawn by the driver itself
                     self._frame = self._display  # note this is inherited from framebuf
 
-                elif self._device == "ssd1306_128x64":
+                elif self._device == "ssd1306_128x64" or self._device == "ssd1309_128x64":
                     import ssd1306
                     self._display = ssd1306.SSD1306_I2C(self.W, self.H, self._i2c)
-                    self._framedata = bytearray(self.W * self.H // 8)
+                    self._framedata = self._display.buffer  # drawn by the driver itself
                     self._frame = self._display  # note this is inherited from framebuf
                     self._display.invert(0)
 
@@ -190,7 +316,7 @@ class MonoDisplay:
                     self._display.init()
                     self._framedata = bytearray(self.W * self.H // 8)
                     self._frame = framebuf.FrameBuffer(self._framedata, self.W, self.H, framebuf.MONO_HLSB)
-                    self.refresh_epaper()
+                    self._run(self._refresh_epaper_steps())  # steps directly, AsyncMonoDisplay makes the public one a coroutine
 
                 elif self._device == "st7735_1in44":
                     from ST7735_128x128 import TFT
@@ -204,16 +330,21 @@ class MonoDisplay:
                     else:
                         self.COLORED, self.UNCOLORED = self._display.WHITE, self._display.BLACK
 
-                    self._framedata = bytearray(self.W*self.H*2)
+                    self._display._setwindowloc((0, 0), (self.W - 1, self.H - 1))
+                    self._display.fill(self.UNCOLORED)
 
-                    if self._tft_colored:
-                        self._frame = framebuf.FrameBuffer(self._framedata, self.W, self.H, framebuf.RGB565)
+                    if tft_mono and not self._tft_colored:
+                        self._setup_tft_mono()
+                    elif tft_indexed and self._tft_colored:
+                        self._setup_tft_indexed()
+                    elif tft_band_rows:
+                        self._setup_tft_banded(tft_band_rows)
+                    elif render_scale > 1:
+                        self._setup_tft_scaled(render_scale)
                     else:
+                        self._framedata = bytearray(self.W*self.H*2)
                         self._frame = framebuf.FrameBuffer(self._framedata, self.W, self.H, framebuf.RGB565)
 
-                    self._display._setwindowloc((0, 0), (self.W - 1, self.H - 1))
-                    self._display.fill(self.UNCOLORED)
-
                 elif self._device == "gc9a01":
                     import gc9a01py
                     self._lcd_backlight_pwm = PWM(self._backlightpin, freq=2000)
@@ -224,10 +355,19 @@ class MonoDisplay:
                     else:
                         self.COLORED, self.UNCOLORED = gc9a01py.WHITE, gc9a01py.BLACK
 
-                    self._framedata = bytearray(self.W * self.H * 2)
-                    # self._frame = self._display  # doing this causes gc9a01 lib do its own framebuf handling
-                    self._frame = framebuf.FrameBuffer(self._framedata, self.W, self.H, framebuf.RGB565)
                     self._display.fill(self.UNCOLORED)
+                    if tft_mono and not self._tft_colored:
+                        self._setup_tft_mono()
+                    elif tft_indexed and self._tft_colored:
+                        self._setup_tft_indexed()
+                    elif tft_band_rows:
+                        self._setup_tft_banded(tft_band_rows)
+                    elif render_scale > 1:
+                        self._setup_tft_scaled(render_scale)
+                    else:
+                        self._framedata = bytearray(self.W * self.H * 2)
+                        # self._frame = self._display  # doing this causes gc9a01 lib do its own framebuf handling
+                        self._frame = framebuf.FrameBuffer(self._framedata, self.W, self.H, framebuf.RGB565)
 
                 else:
                     pass
@@ -244,12 +384,58 @@ class MonoDisplay:
             print(self.spcr + "device must be a string")
             pass
 
-        self._text_size = 8  # currently, we cannot change font size, which is 8 by 8 in mpy framebuf
+        self._text_size = 8 * self._render_scale  # currently, we cannot change font size, which is 8 by 8 in mpy framebuf
         self._max_line_width = self.W // self._text_size   # chars, font size is fixed 8x8
         self._max_line_number = self.H // self._text_size
-        self._page = []
-        self._page_scrollable = []
-        self._counter_log_slow_mode = 0
+        # log lines go to the ST7920's built-in character generator, its font is 8x16:
+        self._text_mode = st7920_text_mode and self._device == "st7920"
+        if self._text_mode:
+            self._max_line_number = self.H // 16
+        # log lines, newest last, in a fixed arena (default depth: a screen, 8 screens with scrollable_log):
+        log_history = log_history or self._max_line_number * (8 if self._scrollable_log else 1)
+        self._log = LogRing(log_history, log_arena_bytes or log_history * self._max_line_width)
+
+        # dirty rectangles as [x0, y0, x1, y1] (inclusive), empty while x1 < x0:
+        # _dirty -> area to send on next show(), _drawn -> area painted since the last flushframe()
+        self._dirty = [0, 0, self.W - 1, self.H - 1]  # first show() sends everything
+        self._drawn = [0, 0, self.W - 1, self.H - 1]
+        # nokia_5110 -> changed columns per 8 px bank as [x0, x1], one position() + data() per bank on show()
+        self._dirty_banks = self._full_banks() if self._device == "nokia_5110" else None
+        self._drawn_banks = self._full_banks() if self._device == "nokia_5110" else None
+
+        # rendered battery, rssi and switch widgets, blitted on redraw (not with a scaled frame):
+        if sprite_cache_bytes and self._render_scale == 1:
+            from sprite_cache import SpriteCache
+            self._sprites = SpriteCache(sprite_cache_bytes)
+        else:
+            self._sprites = None
+        # rendered log() and draw_str() lines with their center/right offsets, blitted on redraw:
+        if text_cache_bytes:
+            from sprite_cache import SpriteCache
+            self._text_lines = SpriteCache(text_cache_bytes)
+
+        # copy of the last sent frame, show() diffs against it when shadow_flush is set (not with a banded frame):
+        self._shadow = bytearray(len(self._framedata)) if shadow_flush and not self._tft_banded else None
+        self._shadow_synced = False
+
+        # pipelined mode: a flusher thread sends a frozen copy of frame N while frame N+1 is drawn
+        self._pipelined = pipelined and not self._tft_banded  # a banded frame can't be frozen by copying it
+        self._drop_stale = drop_stale  # skip show() instead of waiting while the flusher is still busy
+        self.frames_dropped = 0
+        self._flush_src = self._framedata  # buffer the flush reads from
+        if self._pipelined:
+            import _thread
+            self._flush_buf = bytearray(len(self._framedata))
+            self._flush_src = self._flush_buf
+            if self._oled_driver == "sh1106":
+                self._display.displaybuf = self._flush_buf  # driver sends pages from here
+            self._flush_job = None
+            self._flush_busy = _thread.allocate_lock()  # held while a frame is on the bus
+            self._flush_start = _thread.allocate_lock()  # released by show() to wake the flusher up
+            self._flush_start.acquire()
+            _thread.start_new_thread(self._flush_worker, ())
+        elif self._epd_nonblocking:
+            self._epd_queue_buf = bytearray(len(self._framedata))
 
         if self.DEBUG:
             print(self.spcr + "Resolution: {logres}".format(logres=str(self.get_res()[0]) + "x" + str(self.get_res()[1])))
@@ -258,6 +444,82 @@ class MonoDisplay:
             print(self.spcr + "[OK]")
         # --------  INIT DISPLAY & CONSTRUCT SCREEN END  --------
 
+    def _setup_tft_mono(self):
+        """ 1 bit framebuffer on a TFT, COLORED/UNCOLORED become 1/0, their RGB565 colors go to the LUT """
+        self._tft_bpp = 1
+        self._tft_lut = self._build_tft_lut([self.UNCOLORED, self.COLORED], 1)
+        self.COLORED, self.UNCOLORED = 1, 0
+        self._framedata = bytearray(self.W * self.H // 8)
+        self._frame = framebuf.FrameBuffer(self._framedata, self.W, self.H, framebuf.MONO_HLSB)
+        rows = max(1, self._flush_chunk // (self.W * 2))  # RGB565 rows sent per bus write
+        self._tft_linebuf = memoryview(bytearray(rows * self.W * 2))
+
+    def _setup_tft_indexed(self):
+        """ Framebuffer of theme palette indices on a colored TFT, 4 (or 2) bits per pixel """
+        names = sorted(self._theme)
+        if len(names) > 16:
+            raise ValueError("an indexed framebuffer holds 16 theme colors at most")
+        self._tft_bpp = 2 if len(names) <= 4 else 4
+        self._theme_names = names
+        self._tft_lut = self._build_tft_lut(self._theme_palette(self._theme), self._tft_bpp)
+        self._theme = {name: i for i, name in enumerate(names)}
+        if self._inverted:
+            self.COLORED, self.UNCOLORED = self._theme['black'], self._theme['white']
+        else:
+            self.COLORED, self.UNCOLORED = self._theme['white'], self._theme['black']
+        self._framedata = bytearray(self.W * self.H * self._tft_bpp // 8)
+        self._frame = framebuf.FrameBuffer(self._framedata, self.W, self.H,
+                                           framebuf.GS2_HMSB if self._tft_bpp == 2 else framebuf.GS4_HMSB)
+        self._frame.fill(self.UNCOLORED)  # zeros are palette index 0, the first theme name, not the background
+        rows = max(1, self._flush_chunk // (self.W * 2))  # RGB565 rows sent per bus write
+        self._tft_linebuf = memoryview(bytearray(rows * self.W * 2))
+
+    def _setup_tft_banded(self, rows):
+        """ RGB565 frame kept as recorded drawing calls, rendered into a buffer of rows lines per band on show() """
+        from banded_frame import BandedFrame
+        self._tft_banded = True
+        self._frame = BandedFrame(self.W, self.H, min(rows, self.H))
+        self._framedata = self._frame.band_data
+
+    def _setup_tft_scaled(self, scale):
+        """ RGB565 frame of W/scale x H/scale, drawn in screen coordinates, upscaled row by row on show() """
+        from scaled_frame import ScaledFrame
+        self._render_scale = scale
+        self._frame = ScaledFrame(self.W, self.H, scale)
+        self._framedata = self._frame.data
+        rows = max(scale, self._flush_chunk // (self.W * 2) // scale * scale)  # RGB565 rows sent per bus write
+        self._tft_linebuf = memoryview(bytearray(rows * self.W * 2))
+
+    def _theme_palette(self, theme):
+        palette = [theme[name] for name in self._theme_names]
+        return palette + [0] * ((1 << self._tft_bpp) - len(palette))
+
+    def set_theme(self, theme):
+        """ Swap the TFT colors (a dict with the names of consts_mono_display.tft_color_theme), an indexed
+        framebuffer is resent with the new palette on the next show(), RGB565 ones use it from the next drawing """
+        if self._theme_names is not None:
+            self._tft_lut = self._build_tft_lut(self._theme_palette(theme), self._tft_bpp)
+            self._mark_full()
+        else:
+            self._theme = theme
+            if self._sprites is not None:
+                self._sprites.clear()  # rendered with the old colors
+
+    @staticmethod
+    def _build_tft_lut(palette, bpp):
+        """ Returns a table of the RGB565 pixels (framebuf byte order) of every framebuffer byte value,
+        first pixel in the most significant bits (MONO_HLSB, GS4_HMSB), GS2_HMSB starts at the least significant """
+        px = 8 // bpp
+        mask = (1 << bpp) - 1
+        lut = bytearray(256 * px * 2)
+        for value in range(256):
+            for i in range(px):
+                shift = bpp * i if bpp == 2 else 8 - bpp * (i + 1)
+                color = palette[(value >> shift) & mask]
+                lut[(value * px + i) * 2] = color & 0xFF
+                lut[(value * px + i) * 2 + 1] = color >> 8
+        return memoryview(lut)
+
     def get_res(self):
         res = self._devices_dict[self._device][0]
         return res
@@ -266,17 +528,47 @@ class MonoDisplay:
         self_parameters = [self._device,                                           # display name
                            str(self.get_res()[0]) + "x" + str(self.get_res()[1]),  # res
                            self._devices_dict[self._device][1],                    # chip
-                           len(self._framedata)]                                   # buf size
+                           len(self._framedata),                                   # buf size
+                           self._bus_backend,                                      # bus
+                           self.get_bus_rate()]                                    # bytes/sec
 
         return self_parameters
 
+    def get_bus_rate(self):
+        """ Framebuffer bytes per second measured while flushing, 0 before the first show() """
+        if not self._bus_us:
+            return 0
+        return self._bus_bytes * 1000000 // self._bus_us
+
+    def _make_bus(self, user_bus, hw_bus_class, soft_bus_class, **bus_args):
+        """ Returns the caller's bus, a hardware bus (hw_bus=True) or a soft bus as fallback """
+        if user_bus is not None:
+            self._bus_backend = "user " + type(user_bus).__name__
+            return user_bus
+
+        if self._hw_bus:
+            try:
+                hw_bus = hw_bus_class(self._bus_id, **bus_args)
+                self._bus_backend = "{bus_name}({bus_id})".format(bus_name=hw_bus_class.__name__, bus_id=self._bus_id)
+                return hw_bus
+            except (ValueError, OSError, TypeError) as err:
+                print(self.spcr + "hardware bus {bus_id} failed ({err}), using {soft}"
+                      .format(bus_id=self._bus_id, err=err, soft=soft_bus_class.__name__))
+
+        self._bus_backend = soft_bus_class.__name__
+        return soft_bus_class(**bus_args)
+
     def pcd8544_contrast(self, op_voltage=0x00):
+        self.wait_flush()
         self._display.contrast(contrast=op_voltage)
         # set contrast with operating voltage (0x00~0x7f)
         # 0x00 = 3.00V, 0x3f = 6.84V, 0x7f = 10.68V
         # starting at 3.06V, each bit increments voltage by 0.06V at room temperature
 
     def lcd_backlight(self, value, binary=False, inverted=False):
+        return self._run(self._lcd_backlight_steps(value, binary, inverted))
+
+    def _lcd_backlight_steps(self, value, binary=False, inverted=False):
         if value > 1023:
             value = 1023
 
@@ -294,7 +586,7 @@ class MonoDisplay:
                         self._lcd_brightness -= 1
                         if not self._lcd_brightness % 4:
                             self._lcd_backlight_pwm.duty(self._lcd_brightness)
-                            sleep_ms(10)  # was 8
+                            yield 10  # was 8
                     if self.DEBUG:
                         print(self.spcr + "LCD brightness decreased to: " + str(self._lcd_brightness))
                 elif value > self._lcd_brightness:
@@ -302,7 +594,7 @@ class MonoDisplay:
                         self._lcd_brightness += 1
                         if not self._lcd_brightness % 4:
                             self._lcd_backlight_pwm.duty(self._lcd_brightness)
-                            sleep_ms(10)
+                            yield 10
                     if self.DEBUG:
                         print(self.spcr + "LCD brightness increased to: " + str(self._lcd_brightness))
                 else:
@@ -311,12 +603,16 @@ class MonoDisplay:
             return -1
 
     def set_oled_brightness(self, amount):
+        return self._run(self._set_oled_brightness_steps(amount))
+
+    def _set_oled_brightness_steps(self, amount):
+        self.wait_flush()
         if self._device == "sh1106_128x64" or self._device == "ssd1306_128x64" or self._device == "ssd1309_128x64":
             if amount <= self._last_oled_brightness:
                 for dec in range(self._last_oled_brightness, amount, -1):
                     self._display.contrast(dec)
                     self._last_oled_brightness = dec
-                    sleep_ms(4)
+                    yield 4
 
                 if self.DEBUG:
                     print(self.spcr + "oled bl set: {brightness}".format(brightness=self._last_oled_brightness))
@@ -325,7 +621,7 @@ class MonoDisplay:
                 for inc in range(self._last_oled_brightness, amount):
                     self._display.contrast(inc)
                     self._last_oled_brightness = inc
-                    sleep_ms(4)
+                    yield 4
 
                 if self.DEBUG:
                     print(self.spcr + "oled bl set : {brightness}".format(brightness=self._last_oled_brightness))
@@ -336,49 +632,690 @@ class MonoDisplay:
         else:
             pass
 
+    @staticmethod
+    def _grow_rect(rect, x0, y0, x1, y1):
+        if rect[2] < rect[0]:
+            rect[0], rect[1], rect[2], rect[3] = x0, y0, x1, y1
+        else:
+            rect[0], rect[1] = min(rect[0], x0), min(rect[1], y0)
+            rect[2], rect[3] = max(rect[2], x1), max(rect[3], y1)
+
+    def _mark_dirty(self, x, y, w, h):
+        """ Register an area painted into the framebuffer, clipped to the screen """
+        x0, y0 = max(0, int(x)), max(0, int(y))
+        x1, y1 = min(self.W - 1, int(x + w) - 1), min(self.H - 1, int(y + h) - 1)
+        if x1 < x0 or y1 < y0:
+            return
+        self._grow_rect(self._dirty, x0, y0, x1, y1)
+        self._grow_rect(self._drawn, x0, y0, x1, y1)
+        if self._op_box is not None:
+            self._grow_rect(self._op_box, x0, y0, x1, y1)
+        if self._dirty_banks is not None:
+            for bank in range(y0 // 8, y1 // 8 + 1):
+                self._grow_span(self._dirty_banks[bank], x0, x1)
+                self._grow_span(self._drawn_banks[bank], x0, x1)
+
+    @staticmethod
+    def _grow_span(span, x0, x1):
+        if span[1] < span[0]:
+            span[0], span[1] = x0, x1
+        else:
+            span[0], span[1] = min(span[0], x0), max(span[1], x1)
+
+    def _empty_banks(self):
+        return [[self.W, -1] for _ in range(self.H // 8)]
+
+    def _full_banks(self):
+        return [[0, self.W - 1] for _ in range(self.H // 8)]
+
+    def _mark_full(self):
+        self._mark_dirty(0, 0, self.W, self.H)
+
     def flushframe(self):
         """ Fill frame data array without render on the screen """
         self._frame.fill(self.UNCOLORED)
+        if self._oled_driver == "ssd1306" and self._frame is self._display:
+            self._display.dirty_window()  # fill() marks the whole screen, what it really wiped is in _drawn
+        # whatever was painted since the last flushframe() has to be wiped on the screen too
+        drawn = self._drawn
+        if drawn[2] >= drawn[0]:
+            self._grow_rect(self._dirty, drawn[0], drawn[1], drawn[2], drawn[3])
+        self._drawn = [self.W, self.H, -1, -1]
+        if self._dirty_banks is not None:
+            for span, drawn_span in zip(self._dirty_banks, self._drawn_banks):
+                if drawn_span[1] >= drawn_span[0]:
+                    self._grow_span(span, drawn_span[0], drawn_span[1])
+            self._drawn_banks = self._empty_banks()
 
     def rotate(self, deg):
         self._frame.rotate(deg)
+        self._mark_full()
 
     def clear(self):
         """ Clear framebuf and display a blank screen """
+        return self._run(self._clear_steps())
+
+    def _clear_steps(self):
+        if self._replaying:
+            self._frame.fill(self.UNCOLORED)
+            return
         if self._device == "1in54_epd":
-            self._display.clear_frame_memory(0xff)  # empty display's internal frb
+            self.wait_flush()
+            self._display.clear_frame_memory(0xff, self._epd_partial)  # empty display's internal frb
             self._frame.fill(self.UNCOLORED)  # empty framebuffer
-            self._display.display_frame()
+            yield from self._epd_refresh_steps()
+            self._count_flush()
+            self._dirty = [self.W, self.H, -1, -1]
+            self._drawn = [self.W, self.H, -1, -1]
+            self._sync_shadow()
         else:
             self._frame.fill(self.UNCOLORED)
-            self.show()
+            self._drawn = [self.W, self.H, -1, -1]
+            if self._drawn_banks is not None:
+                self._drawn_banks = self._empty_banks()
+            yield from self._show_steps(full_update=True)
+
+    def show(self, full_update=False):
+        """ Sets frame memory with composed framebuffer and show the dirty area on screen """
+        return self._run(self._show_steps(full_update))
+
+    def _show_steps(self, full_update=False):
+        if self._replaying:
+            return
+        if self._coalesce and not full_update:
+            now = ticks_ms()
+            if self._pending_since is None:
+                self._pending_since = now
+            wait = self._coalesce_wait(now)  # quiet since the previous request, this one starts a new quiet period
+            self._last_request = now
+            if wait:
+                self._arm_coalesce(self._coalesce_wait(now))
+                return  # sent when the timer fires, or by a show() after a quiet period or past the deadline
+        yield from self._flush_frame_steps(full_update)
+
+    def begin_display_list(self, display_list=None):
+        """ Record the widget calls into a DisplayList (a new one by default) until end_display_list(),
+        they are drawn and shown as usual, returns the list """
+        self._display_list = DisplayList() if display_list is None else display_list
+        return self._display_list
+
+    def end_display_list(self):
+        display_list, self._display_list = self._display_list, None
+        return display_list
+
+    def _record_begin(self):
+        self._drawing += 1
+        if self._display_list is None or self._op_box is not None:
+            return None  # not recording, or a widget called by a recorded one
+        self._op_box = [self.W, self.H, -1, -1]
+        return self._op_box
+
+    def _record_end(self, box, name, args, kwargs):
+        self._drawing -= 1
+        if box is None:
+            return
+        self._op_box = None
+        self._display_list.add(name, args, kwargs, tuple(box) if box[2] >= box[0] else None)
+
+    def replay(self, display_list, target=None):
+        """ Execute the ops of a DisplayList into target (a framebuf of the display's size and format) without
+        touching the screen or the dirty areas, target=None draws into the display's frame, show() sends it """
+        frame, recording, marks = self._frame, self._display_list, self._save_marks()
+        if target is not None:
+            self._frame = target
+        self._display_list = None
+        self._replaying = True
+        try:
+            for name, args, kwargs, _ in display_list:
+                steps = getattr(self, name)(*args, **dict(kwargs))
+                if name.endswith("_steps"):
+                    for _ in steps:  # waits (charging animation) are skipped
+                        pass
+        finally:
+            self._replaying = False
+            self._frame, self._display_list = frame, recording
+            if target is not None:
+                self._restore_marks(marks)
+
+    def _save_marks(self):
+        return self._dirty[:], self._drawn[:], \
+            self._dirty_banks and [span[:] for span in self._dirty_banks], \
+            self._drawn_banks and [span[:] for span in self._drawn_banks]
+
+    def _restore_marks(self, marks):
+        self._dirty, self._drawn, self._dirty_banks, self._drawn_banks = marks
+
+    def _frame_format(self):
+        """ Returns (framebuf format, bits per pixel) of the frame the widgets draw into """
+        if self._tft_lut is not None:
+            if self._tft_bpp == 1:
+                return framebuf.MONO_HLSB, 1
+            return (framebuf.GS2_HMSB if self._tft_bpp == 2 else framebuf.GS4_HMSB), self._tft_bpp
+        elif self._device == "st7735_1in44" or self._device == "gc9a01":
+            return framebuf.RGB565, 16
+        elif self._device == "st7920" or self._device == "1in54_epd":
+            return framebuf.MONO_HLSB, 1
+        return framebuf.MONO_VLSB, 1
+
+    def _new_framebuffer(self, w, h):
+        """ Returns a framebuf of w x h in the frame's format and its size in bytes """
+        fmt, bpp = self._frame_format()
+        if fmt == framebuf.MONO_VLSB:
+            size = w * ((h + 7) // 8)
+        else:
+            size = (w * bpp + 7) // 8 * h  # rows are padded to whole bytes
+        return framebuf.FrameBuffer(bytearray(size), w, h, fmt), size
+
+    def _text(self, text, x, y, color, textalign=None):
+        """ Draw a line of text at x, or aligned on the screen by textalign ("left", "center", "right"),
+        blitted from the text cache when it's on """
+        if self._text_lines is None:
+            if textalign == "center":
+                x = (self.W // 2) - ((len(text) * self._text_size) // 2)
+            elif textalign == "right":
+                x = self.W - len(text) * self._text_size
+            elif textalign is not None:
+                x = 0
+            self._frame.text(text, x, y, color)
+            return
+        if not text:
+            return
+        key = (text, color, self._frame_format()[0])
+        line = self._text_lines.get(key)
+        if line is None:
+            strip, size = self._new_framebuffer(len(text) * 8, 8)
+            transparent = 0 if color else 1  # glyph background, left out of the blit as text() leaves it
+            strip.fill(transparent)
+            strip.text(text, 0, 0, color)
+            line = (strip, transparent,
+                    (self.W // 2) - ((len(text) * self._text_size) // 2), self.W - len(text) * self._text_size)
+            self._text_lines.put(key, line, size)
+        if textalign == "center":
+            x = line[2]
+        elif textalign == "right":
+            x = line[3]
+        elif textalign is not None:
+            x = 0
+        self._blit(line[0], x, y, line[1], len(text) * 8, 8)
+
+    def _blit(self, fbuf, x, y, key, w, h):
+        """ blit() of a w x h framebuf, an OLED driver drawn into directly is told the size to mark dirty """
+        if self._frame is self._display:
+            self._frame.blit(fbuf, x, y, key, None, w, h)
+        else:
+            self._frame.blit(fbuf, x, y, key)
+
+    def get_text_cache_hit_rate(self):
+        """ Share of the text lines drawn from the text cache, None when it's off """
+        if self._text_lines is None:
+            return None
+        return self._text_lines.hit_rate()
+
+    def _blit_sprite(self, key, x, y, w, h, transparent, draw):
+        """ Blit the sprite of a widget state, rendered by draw(x, y) into a framebuf of w x h in the frame's
+        format on the first use, transparent is the color left out (-1: none) """
+        fmt = self._frame_format()[0]
+        key += (self._device in ("st7735_1in44", "gc9a01") and self._tft_colored, fmt)
+        sprite = self._sprites.get(key)
+        if sprite is None:
+            sprite, size = self._new_framebuffer(int(w), int(h))
+            sprite.fill(self.UNCOLORED)
+            frame, recording, op_box, sprites, marks = \
+                self._frame, self._display_list, self._op_box, self._sprites, self._save_marks()
+            self._frame, self._display_list, self._op_box, self._sprites = sprite, None, None, None
+            try:
+                draw(0, 0)
+            finally:
+                self._frame, self._display_list, self._op_box, self._sprites = frame, recording, op_box, sprites
+                self._restore_marks(marks)
+            sprites.put(key, sprite, size)
+        self._blit(sprite, x, y, transparent, int(w), int(h))
+
+    def flush_pending(self):
+        """ Send the frame marked pending by show() once it's due (coalesce mode, the timer does it too),
+        returns ms until it should be called again, None when nothing is pending """
+        return self._run(self._flush_pending_steps())
+
+    def _flush_pending_steps(self):
+        if self._pending_since is None:
+            return None
+        wait = self._coalesce_wait(ticks_ms())
+        if wait:
+            return wait
+        yield from self._flush_frame_steps()
+        return None
+
+    def _coalesce_wait(self, now):
+        """ ms left until the pending frame may be sent: quiet period or staleness deadline, then the rate cap """
+        quiet = 0 if self._last_request is None else self._coalesce_quiet_ms - ticks_diff(now, self._last_request)
+        stale = self._coalesce_stale_ms - ticks_diff(now, self._pending_since)
+        wait = max(0, min(quiet, stale))
+        while self._flush_times and ticks_diff(now, self._flush_times[0]) >= 60000:
+            self._flush_times.pop(0)
+        if len(self._flush_times) >= self._coalesce_per_min:
+            wait = max(wait, 60000 - ticks_diff(now, self._flush_times[0]))
+        return wait
+
+    def _arm_coalesce(self, wait):
+        """ (Re)start the one-shot timer which sends the pending frame in wait ms """
+        if self._coalesce_timer is None:
+            self._coalesce_timer = Timer(self._coalesce_timer_id)
+        self._coalesce_timer.init(mode=Timer.ONE_SHOT, period=max(1, wait), callback=self._coalesce_irq_cb)
+
+    def _coalesce_irq(self, _):
+        schedule(self._coalesce_due_cb, None)  # timer callbacks may run as an IRQ, the flush runs from the scheduler
+
+    def _coalesce_due(self, _):
+        if self._pending_since is None:
+            return
+        if self._drawing:
+            self._arm_coalesce(20)  # a drawing method is halfway, what it painted may not be marked dirty yet
+            return
+        wait = self._run(self._flush_pending_steps())
+        if wait:
+            self._arm_coalesce(wait)
+
+    def _count_flush(self):
+        if self._coalesce:
+            self._flush_times.append(ticks_ms())  # full updates and e-paper clears count against the rate cap too
+            self._pending_since = None
+
+    def _flush_frame_steps(self, full_update=False):
+        self._count_flush()
+        if self._pipelined:
+            self._queue_frame(full_update)
+            return
+        if self._epd_nonblocking:
+            self._queue_epd_frame(full_update)
+            return
+        yield from self._send_steps(self._collect_regions(full_update), full_update)
+        self._sync_shadow()
+
+    def _collect_regions(self, full_update=False):
+        """ Returns the areas to send (dirty rectangle or shadow diff) and starts a new dirty rectangle """
+        if self._oled_driver == "ssd1306":
+            window = self._display.dirty_window()  # draws straight on the driver's framebuf count too
+            if window is not None:
+                op_box, self._op_box = self._op_box, None  # not the recorded widget's area, whole pages
+                self._mark_dirty(window[0], window[1] * 8, window[2] - window[0] + 1, (window[3] - window[1] + 1) * 8)
+                self._op_box = op_box
+        if full_update:
+            self._mark_full()
+
+        if self._shadow is not None and self._shadow_synced and not full_update:
+            regions = self._diff_regions()
+        elif self._dirty_banks is not None:
+            regions = [[span[0], bank * 8, span[1], bank * 8 + 7]
+                       for bank, span in enumerate(self._dirty_banks) if span[1] >= span[0]]
+        elif self._dirty[2] >= self._dirty[0]:
+            regions = [self._dirty]
+        else:
+            regions = []
+        self._dirty = [self.W, self.H, -1, -1]
+        if self._dirty_banks is not None:
+            self._dirty_banks = self._empty_banks()
+
+        if self._oled_driver == "sh1106":
+            # SH1106 driver keeps track of the columns changed by its own framebuf methods too
+            oled = self._display
+            for region in regions:
+                oled.register_updates(region[1], region[3], region[0], region[2])
+            regions = [[oled.page_x0[page], page * 8, oled.page_x1[page], page * 8 + 7]
+                       for page in range(oled.pages) if oled.pages_to_update & 1 << page]
+            oled.pages_to_update = 0
+        elif self._device == "1in54_epd" and len(regions) > 1:
+            bounds = [self.W, self.H, -1, -1]  # one refresh per show() on e-paper
+            for region in regions:
+                self._grow_rect(bounds, region[0], region[1], region[2], region[3])
+            regions = [bounds]
+        return regions
+
+    def _send_steps(self, regions, full_update=False):
+        # time spent between the steps is bus time, the waits (e-paper busy, async turns) are not counted
+        steps = self._write_steps(regions, full_update)
+        while True:
+            start = ticks_us()
+            try:
+                wait = next(steps)
+            except StopIteration:
+                break
+            finally:
+                self._bus_us += ticks_diff(ticks_us(), start)
+            yield wait
+
+    def _write_steps(self, regions, full_update=False):
+        if self._oled_driver == "sh1106":
+            for x0, y0, x1, y1 in regions:
+                self._display.show_page(y0 // 8, x0, x1)
+                self._bus_bytes += x1 - x0 + 1
+            yield 0
+        else:
+            for x0, y0, x1, y1 in regions:
+                yield from self._flush_steps(x0, y0, x1, y1, full_update)
+
+    def _queue_frame(self, full_update=False):
+        if not self._flush_busy.acquire(not self._drop_stale):
+            # flusher is behind: skip this frame, its dirty area goes out with the next show()
+            self.frames_dropped += 1
+            if full_update:
+                self._mark_full()
+            return
+        self._flush_job = (self._collect_regions(full_update), full_update)
+        self._flush_buf[:] = self._framedata  # frame N is frozen for the flusher, frame N+1 is drawn meanwhile
+        self._sync_shadow()
+        self._flush_start.release()
 
-    def show(self):
-        """ Sets frame memory with composed framebuffer and show on screen """
+    def _flush_worker(self):
+        while True:
+            self._flush_start.acquire()  # sleep until show() hands over a frame
+            for wait in self._send_steps(self._flush_job[0], self._flush_job[1]):  # not _run(), it's not drawing
+                if wait:
+                    sleep_ms(wait)
+            self._flush_busy.release()
+
+    def _queue_epd_frame(self, full_update=False):
+        regions = self._collect_regions(full_update)
+        if not regions:
+            return
+        self._epd_queuing = True
+        if self._epd_queued is None:
+            self._epd_queued = [regions[0], full_update]
+        else:  # the queued frame was not sent yet, the new one replaces it and covers its area too
+            bounds = self._epd_queued[0]
+            self._grow_rect(bounds, regions[0][0], regions[0][1], regions[0][2], regions[0][3])
+            self._epd_queued[1] = self._epd_queued[1] or full_update
+        self._epd_queue_buf[:] = self._framedata
+        self._sync_shadow()
+        self._epd_queuing = False
+        if not self._epd_busy:
+            self._start_epd_frame()
+
+    def _start_epd_frame(self):
+        bounds, full_update = self._epd_queued
+        self._epd_queued = None
+        image, x0, x1 = self._epd_window(self._epd_queue_buf, bounds[0], bounds[1], bounds[2], bounds[3], True)
+        y0, y1 = bounds[1], bounds[3]
+        partial = self._epd_use_partial(full_update)
+        self._display.set_frame_memory(image, x0, y0, x1 - x0 + 1, y1 - y0 + 1, self._flush_chunk)
+        self._bus_bytes += len(image)
+        self._epd_shown = (image, x0, y0, x1 - x0 + 1, y1 - y0 + 1) if self._epd_partial else None
+        self._epd_busy = True
+        self._epd_count_refresh(partial)
+        self._display.display_frame(wait=False, partial=partial, callback=self._epd_frame_done)
+
+    def _epd_frame_done(self, _):
+        """ BUSY pin went low (scheduled from its IRQ): sync the previous image RAM, start the queued frame """
+        self._epd_busy = False
+        if self._epd_shown is not None:
+            image, x, y, w, h = self._epd_shown
+            self._epd_shown = None
+            self._display.set_previous_frame_memory(image, x, y, w, h, self._flush_chunk)
+            self._bus_bytes += len(image)
+        if self._epd_queued is not None and not self._epd_queuing:
+            self._start_epd_frame()
+
+    def wait_flush(self):
+        """ Wait until the flusher thread has sent the last frame (pipelined mode),
+        or the e-paper has finished the refresh in flight and the queued one (nonblocking mode) """
+        if self._pipelined:
+            self._flush_busy.acquire()
+            self._flush_busy.release()
+        elif self._epd_nonblocking:
+            delay = 1
+            while self._epd_busy or self._epd_queued is not None:
+                sleep_ms(delay)  # the IRQ callback runs meanwhile
+                delay = min(delay * 2, 20)
+
+    def _run(self, steps):
+        """ Drive a step generator to its end, sleeping whenever it asks to wait (ms) """
+        self._drawing += 1
+        try:
+            while True:
+                wait = next(steps)
+                if wait:
+                    sleep_ms(wait)
+        except StopIteration as done:
+            return done.value
+        finally:
+            self._drawing -= 1
+
+    def _sync_shadow(self):
+        if self._shadow is not None:
+            self._shadow[:] = self._framedata
+            self._shadow_synced = True
+
+    def _framebuffer_layout(self):
+        """ Returns (bytes per band, pixel rows per band, bytes per compare unit, pixels per compare unit) """
+        if self._device == "st7920":
+            return self.W // 8, 1, 2, 16  # MONO_HLSB, GDRAM is written in 16 px words
+        elif self._device == "1in54_epd":
+            return self.W // 8, 1, 1, 8  # MONO_HLSB
+        elif self._tft_lut is not None:
+            return self.W * self._tft_bpp // 8, 1, 1, 8 // self._tft_bpp  # indexed, expanded on the way out
+        elif self._render_scale > 1:
+            s = self._render_scale
+            return self.W // s * 2, s, 2, s  # RGB565 at 1/s resolution, upscaled on the way out
+        elif self._device == "st7735_1in44" or self._device == "gc9a01":
+            return self.W * 2, 1, 2, 1  # RGB565
+        elif self._oled_driver == "sh1106":
+            return self._display.width, 8, 1, 1  # MONO_VLSB pages, ssd1309 driver is 2 px wider
+        else:
+            return self.W, 8, 1, 1  # MONO_VLSB pages
+
+    def _diff_regions(self):
+        """ Compare the framebuffer with the last sent frame, returns the changed spans merged into rectangles """
+        fd, sd = self._framedata, self._shadow
+        stride, band_h, unit, unit_px = self._framebuffer_layout()
+        regions = []
+        run = None  # consecutive changed bands are sent as one rectangle
+        for band in range(len(fd) // stride):
+            start = band * stride
+            if fd[start:start + stride] == sd[start:start + stride]:
+                if run is not None:
+                    regions.append(run)
+                    run = None
+                continue
+            first, last = start, start + stride - 1
+            while fd[first] == sd[first]:
+                first += 1
+            while fd[last] == sd[last]:
+                last -= 1
+            x0 = (first - start) // unit * unit_px
+            x1 = min(self.W - 1, ((last - start) // unit + 1) * unit_px - 1)
+            y1 = band * band_h + band_h - 1
+            if run is not None and self._dirty_banks is not None:
+                regions.append(run)  # banks are addressed one by one anyway, don't widen their spans
+                run = None
+            if run is None:
+                run = [x0, band * band_h, x1, y1]
+            else:
+                self._grow_rect(run, x0, run[1], x1, y1)
+        if run is not None:
+            regions.append(run)
+        return regions
+
+    def _flush_steps(self, x0, y0, x1, y1, full_update=False):
+        """ Send a rectangle of the framebuffer using the driver's addressing, aligned to its RAM layout,
+        yields between bus transfers so the async API can let other tasks run """
         if self._device == "st7920":
-            self._display.show(data=self._framedata)
+            for y in range(y0, y1 + 1):
+                # driver sends only the 16 px GDRAM words that differ from what it sent before
+                self._bus_bytes += self._display.show_window(self._flush_src, x0, y, x1, y, full_update)
+                yield 0
         elif self._device == "nokia_5110":
-            self._display.data(data=self._framedata)
-        elif self._device == "sh1106_128x64" or self._device == "ssd1309_128x64":
-            self._display.show()  # full_update=True
-        elif self._device == "ssd1306_128x64":
-            self._display.show()
+            fd = memoryview(self._flush_src)
+            for bank in range(y0 // 8, y1 // 8 + 1):
+                self._display.position(x0, bank)
+                self._display.data(fd[bank * self.W + x0:bank * self.W + x1 + 1])
+                self._bus_bytes += x1 - x0 + 1
+                yield 0
+        elif self._oled_driver == "ssd1306":
+            self._display.show_window(x0, y0 // 8, x1, y1 // 8, self._flush_src)
+            self._bus_bytes += (x1 - x0 + 1) * (y1 // 8 - y0 // 8 + 1)
+            yield 0
         elif self._device == "1in54_epd":
-            self._display.set_frame_memory(self._framedata, 0, 0, self.W, self.H)
-            self._display.display_frame()
-        elif self._device == "st7735_1in44":
-            self._display._writedata(self._framedata)
-        elif self._device == "gc9a01":
-            self._display._write(None, self._framedata)
+            image, x0, x1 = self._epd_window(self._flush_src, x0, y0, x1, y1)
+            partial = self._epd_use_partial(full_update)
+            self._display.set_frame_memory(image, x0, y0, x1 - x0 + 1, y1 - y0 + 1, self._flush_chunk)
+            self._bus_bytes += len(image)
+            yield 0
+            yield from self._epd_refresh_steps(partial)
+            if self._epd_partial:
+                # the next partial update compares against this window, both RAMs have to hold the shown image
+                self._display.set_previous_frame_memory(image, x0, y0, x1 - x0 + 1, y1 - y0 + 1, self._flush_chunk)
+                self._bus_bytes += len(image)
+                yield 0
+        elif self._device == "st7735_1in44" or self._device == "gc9a01":
+            if self._tft_lut is not None:
+                px = 8 // self._tft_bpp
+                x0, x1 = x0 // px * px, min(self.W - 1, x1 // px * px + px - 1)  # whole framebuffer bytes
+            elif self._render_scale > 1:
+                s = self._render_scale
+                x0, y0 = x0 // s * s, y0 // s * s  # whole render pixels
+                x1, y1 = min(self.W - 1, x1 // s * s + s - 1), min(self.H - 1, y1 // s * s + s - 1)
+            if self._device == "st7735_1in44":
+                self._display._setwindowloc((x0, y0), (x1, y1))
+            else:
+                self._display._set_window(x0, y0, x1, y1)
+            if self._tft_lut is not None:
+                yield from self._tft_expand_steps(x0, y0, x1, y1)
+            elif self._tft_banded:
+                yield from self._tft_band_steps(x0, y0, x1, y1)
+            elif self._render_scale > 1:
+                yield from self._tft_upscale_steps(x0, y0, x1, y1)
+            else:
+                yield from self._tft_rows_steps(self._flush_src, x0, y0, x1, y1)
         else:
             return -1
 
+    def _tft_rows_steps(self, src, x0, y0, x1, y1):
+        """ Stream a window of RGB565 rows of src, in chunks of at most chunk_size bytes """
+        fd = memoryview(src)
+        stride = self.W * 2
+        if x0 == 0 and x1 == self.W - 1:
+            spans = [(y0 * stride, (y1 + 1) * stride)]  # full-width rows are contiguous
+        else:
+            spans = [(y * stride + x0 * 2, y * stride + (x1 + 1) * 2) for y in range(y0, y1 + 1)]
+        for start, end in spans:
+            for chunk in range(start, end, self._flush_chunk):
+                self._tft_write(fd[chunk:min(end, chunk + self._flush_chunk)])
+                yield 0
+
+    def _tft_band_steps(self, x0, y0, x1, y1):
+        """ Stream a window of the banded frame, each band crossing it is rendered and its rows are sent,
+        they follow each other in the window set by the caller """
+        frame = self._frame
+        for top in range(y0 - y0 % frame.rows, y1 + 1, frame.rows):
+            frame.render(top)
+            yield 0
+            yield from self._tft_rows_steps(frame.band_data, x0, max(y0, top) - top,
+                                            x1, min(y1, top + frame.rows - 1) - top)
+
+    def _tft_write(self, data):
+        if self._device == "st7735_1in44":
+            self._display._writedata(data)
+        else:
+            self._display._write(None, data)
+        self._bus_bytes += len(data)
+
+    def _tft_expand_steps(self, x0, y0, x1, y1):
+        """ Stream a window of the indexed framebuffer as RGB565, rows are expanded through the LUT
+        into the line buffer and sent when it's full """
+        src, lut, buf = self._flush_src, self._tft_lut, self._tft_linebuf
+        px = 8 // self._tft_bpp
+        unit = px * 2  # RGB565 bytes of one framebuffer byte
+        stride = self.W // px
+        row_bytes = (x1 - x0 + 1) * 2
+        n = 0
+        for y in range(y0, y1 + 1):
+            start = y * stride + x0 // px
+            for i in range(start, start + (x1 - x0 + 1) // px):
+                v = src[i] * unit
+                buf[n:n + unit] = lut[v:v + unit]
+                n += unit
+            if n + row_bytes > len(buf) or y == y1:
+                self._tft_write(buf[:n])
+                n = 0
+                yield 0
+
+    def _tft_upscale_steps(self, x0, y0, x1, y1):
+        """ Stream a window of the reduced frame at screen resolution, each render row is widened into the
+        line buffer once and repeated for the next scale - 1 rows, sent when the buffer is full """
+        src, buf, s = self._flush_src, self._tft_linebuf, self._render_scale
+        stride = self.W // s * 2
+        row_bytes = (x1 - x0 + 1) * 2
+        n = 0
+        for sy in range(y0 // s, y1 // s + 1):
+            row = n
+            for i in range(sy * stride + x0 // s * 2, sy * stride + (x1 // s + 1) * 2, 2):
+                lo, hi = src[i], src[i + 1]
+                for _ in range(s):
+                    buf[n] = lo
+                    buf[n + 1] = hi
+                    n += 2
+            for _ in range(s - 1):
+                buf[n:n + row_bytes] = buf[row:row + row_bytes]
+                n += row_bytes
+            if n + row_bytes * s > len(buf) or sy == y1 // s:
+                self._tft_write(buf[:n])
+                n = 0
+                yield 0
+
+    def _epd_window(self, src, x0, y0, x1, y1, copy=False):
+        """ Returns the e-paper RAM image of a rectangle and its x range, widened to whole bytes """
+        x0, x1 = x0 & 0xF8, x1 | 0x07  # RAM x address is in 8 px units
+        stride = self.W // 8
+        if x0 == 0 and x1 == self.W - 1:
+            image = memoryview(src)[y0 * stride:(y1 + 1) * stride]
+            return (bytearray(image) if copy else image), x0, x1
+        row_len = (x1 - x0 + 1) // 8
+        image = bytearray(row_len * (y1 - y0 + 1))
+        for row in range(y1 - y0 + 1):
+            start = (y0 + row) * stride + x0 // 8
+            image[row * row_len:(row + 1) * row_len] = src[start:start + row_len]
+        return image, x0, x1
+
+    def _epd_use_partial(self, full_update=False):
+        # ghosting governor: partial refresh until n of them or t seconds since the last full one
+        return self._epd_partial and not full_update and \
+            self._epd_partial_count < self._epd_full_every and \
+            ticks_diff(ticks_ms(), self._epd_last_full) < self._epd_full_after_ms
+
+    def _epd_count_refresh(self, partial):
+        if partial:
+            self._epd_partial_count += 1
+        else:
+            self._epd_partial_count = 0
+            self._epd_last_full = ticks_ms()
+
+    def _epd_refresh_steps(self, partial=False):
+        self._display.display_frame(wait=False, partial=partial)
+        self._epd_count_refresh(partial)
+        wait = 1  # adaptive poll, the overshoot stays below 20 ms
+        while self._display.is_busy():
+            yield wait
+            wait = min(wait * 2, 20)
+
     def refresh_epaper(self):
         """ Run a full display erase routine (slow) """
+        return self._run(self._refresh_epaper_steps())
+
+    def _refresh_epaper_steps(self):
+        self.wait_flush()
+        # RAM is filled once with the final color, the other passes show it inverted instead of rewriting it
+        final = self._epd_mem_clear[-1]
+        self._display.clear_frame_memory(final, self._epd_partial)
+        yield 0
+        inverted = False
         for i in self._epd_mem_clear:
-            self._display.clear_frame_memory(i)
-            self._display.display_frame()
-
+            if (i != final) != inverted:
+                inverted = not inverted
+                self._display.invert_frame_memory(inverted)
+            yield from self._epd_refresh_steps()
+        if inverted:
+            self._display.invert_frame_memory(False)
+
+    @recorded
     def trace(self, frequency=1, phase=0, amplitude=10, time_ms=1000):
         scale_offset = 20
         curve = []  # storing coords
@@ -388,6 +1325,9 @@ class MonoDisplay:
             x = 10 + t * step
             y = self.H / 2 + diversion * self.H / scale_offset
             curve.append((x, y))
+        y_min = min(pixel[1] for pixel in curve)
+        y_max = max(pixel[1] for pixel in curve)
+        self._mark_dirty(10, y_min, self.W - scale_offset + 1, y_max - y_min + 1)
         color = self.COLORED
         if self._device == "1in54_epd":
             color ^= self.COLORED
@@ -395,12 +1335,13 @@ class MonoDisplay:
         for pixel in curve:
             if self._device == "st7735_1in44":
                 if self._tft_colored:
-                    self._frame.pixel(int(pixel[0]), int(pixel[1]), consts_mono_display.tft_color_theme['trace_color'])
+                    self._frame.pixel(int(pixel[0]), int(pixel[1]), self._theme['trace_color'])
                 else:
-                    self._frame.pixel(int(pixel[0]), int(pixel[1]), consts_mono_display.tft_color_theme['white'])
+                    self._frame.pixel(int(pixel[0]), int(pixel[1]), self._theme['white'])
             else:
                 self._frame.pixel(int(pixel[0]), int(pixel[1]), color)
 
+    @recorded
     def draw_circle(self, x, y, radius, colored, filled):
         # Bresenham algorithm
         x_pos = - radius
@@ -408,19 +1349,20 @@ class MonoDisplay:
         err = 2 - 2 * radius
         if x >= self.W or y >= self.H:
             return
+        self._mark_dirty(x - radius, y - radius, 2 * radius + 1, 2 * radius + 1)
         while True:
             if colored:
                 if self._device == "st7735_1in44" or self._device == "gc9a01":
                     if self._tft_colored:
-                        self._frame.pixel(x - x_pos, y + y_pos, consts_mono_display.tft_color_theme['circle_color'])
-                        self._frame.pixel(x + x_pos, y + y_pos, consts_mono_display.tft_color_theme['circle_color'])
-                        self._frame.pixel(x + x_pos, y - y_pos, consts_mono_display.tft_color_theme['circle_color'])
-                        self._frame.pixel(x - x_pos, y - y_pos, consts_mono_display.tft_color_theme['circle_color'])
+                        self._frame.pixel(x - x_pos, y + y_pos, self._theme['circle_color'])
+                        self._frame.pixel(x + x_pos, y + y_pos, self._theme['circle_color'])
+                        self._frame.pixel(x + x_pos, y - y_pos, self._theme['circle_color'])
+                        self._frame.pixel(x - x_pos, y - y_pos, self._theme['circle_color'])
                     else:
-                        self._frame.pixel(x - x_pos, y + y_pos, consts_mono_display.tft_color_theme['white'])
-                        self._frame.pixel(x + x_pos, y + y_pos, consts_mono_display.tft_color_theme['white'])
-                        self._frame.pixel(x + x_pos, y - y_pos, consts_mono_display.tft_color_theme['white'])
-                        self._frame.pixel(x - x_pos, y - y_pos, consts_mono_display.tft_color_theme['white'])
+                        self._frame.pixel(x - x_pos, y + y_pos, self._theme['white'])
+                        self._frame.pixel(x + x_pos, y + y_pos, self._theme['white'])
+                        self._frame.pixel(x + x_pos, y - y_pos, self._theme['white'])
+                        self._frame.pixel(x - x_pos, y - y_pos, self._theme['white'])
 
                 else:
                     self._frame.pixel(x - x_pos, y + y_pos, self.COLORED)
@@ -437,11 +1379,11 @@ class MonoDisplay:
             if filled:
                 if self._device == "st7735_1in44" or self._device == "gc9a01":
                     if self._tft_colored:
-                        self._frame.hline(x + x_pos, y + y_pos, 2 * (-x_pos) + 1, consts_mono_display.tft_color_theme['circle_fill_color'])
-                        self._frame.hline(x + x_pos, y - y_pos, 2 * (-x_pos) + 1, consts_mono_display.tft_color_theme['circle_fill_color'])
+                        self._frame.hline(x + x_pos, y + y_pos, 2 * (-x_pos) + 1, self._theme['circle_fill_color'])
+                        self._frame.hline(x + x_pos, y - y_pos, 2 * (-x_pos) + 1, self._theme['circle_fill_color'])
                     else:
-                        self._frame.hline(x + x_pos, y + y_pos, 2 * (-x_pos) + 1, consts_mono_display.tft_color_theme['white'])
-                        self._frame.hline(x + x_pos, y - y_pos, 2 * (-x_pos) + 1, consts_mono_display.tft_color_theme['white'])
+                        self._frame.hline(x + x_pos, y + y_pos, 2 * (-x_pos) + 1, self._theme['white'])
+                        self._frame.hline(x + x_pos, y - y_pos, 2 * (-x_pos) + 1, self._theme['white'])
                 else:
                     self._frame.hline(x + x_pos, y + y_pos, 2 * (-x_pos) + 1, self.COLORED)
                     self._frame.hline(x + x_pos, y - y_pos, 2 * (-x_pos) + 1, self.COLORED)
@@ -458,6 +1400,7 @@ class MonoDisplay:
             if x_pos > 0:
                 break
 
+    @recorded
     def draw_switch(self, x, y, state=0, scale=1):
         default_width = 16
         default_height = default_width * 2
@@ -471,6 +1414,11 @@ class MonoDisplay:
         sw_state_bg_y = y + gap // 2
         sw_dot_x = x + sw_body_width // 2
         sw_dot_y = sw_state_bg_y + sw_state_bg_height // 2
+        self._mark_dirty(x, y, sw_body_width, sw_body_height)
+        if self._sprites is not None:  # the body covers the whole switch, the sprite is blitted opaque
+            self._blit_sprite(("switch", bool(state), scale), x, y, sw_body_width, sw_body_height, -1,
+                              lambda x0, y0: self.draw_switch(x0, y0, state, scale))
+            return
 
         if self._device == "1in54_epd":
             if state:
@@ -506,14 +1454,14 @@ class MonoDisplay:
                 if self._device == "st7735_1in44" or self._device == "gc9a01":
                     if self._tft_colored:
                         self._frame.fill_rect(x, y, sw_body_width, sw_body_height,
-                                              consts_mono_display.tft_color_theme['sw_body_color'])
+                                              self._theme['sw_body_color'])
                         self._frame.fill_rect(sw_state_bg_x, sw_state_bg_y, sw_state_bg_width, sw_state_bg_height,
-                                              consts_mono_display.tft_color_theme['sw_toggle_bg_color'])
+                                              self._theme['sw_toggle_bg_color'])
                     else:
                         self._frame.fill_rect(x, y, sw_body_width, sw_body_height,
-                                              consts_mono_display.tft_color_theme['white'])
+                                              self._theme['white'])
                         self._frame.fill_rect(sw_state_bg_x, sw_state_bg_y, sw_state_bg_width, sw_state_bg_height,
-                                              consts_mono_display.tft_color_theme['black'])
+                                              self._theme['black'])
                 else:
                     self._frame.fill_rect(x, y, sw_body_width, sw_body_height, self.COLORED)
                     self._frame.fill_rect(sw_state_bg_x, sw_state_bg_y, sw_state_bg_width, sw_state_bg_height, self.UNCOLORED)
@@ -522,14 +1470,14 @@ class MonoDisplay:
                     if self._device == "st7735_1in44" or self._device == "gc9a01":
                         if self._tft_colored:
                             self._frame.pixel(sw_dot_x - 1, sw_dot_y - 1,
-                                              consts_mono_display.tft_color_theme['sw_toggle_color'])
+                                              self._theme['sw_toggle_color'])
                             self._frame.pixel(sw_dot_x, sw_dot_y - 1,
-                                              consts_mono_display.tft_color_theme['sw_toggle_color'])
+                                              self._theme['sw_toggle_color'])
                         else:
                             self._frame.pixel(sw_dot_x - 1, sw_dot_y - 1,
-                                              consts_mono_display.tft_color_theme['white'])
+                                              self._theme['white'])
                             self._frame.pixel(sw_dot_x, sw_dot_y - 1,
-                                              consts_mono_display.tft_color_theme['white'])
+                                              self._theme['white'])
 
                     else:
                         self._frame.pixel(sw_dot_x - 1, sw_dot_y - 1, 1)
@@ -538,10 +1486,10 @@ class MonoDisplay:
                     if self._device == "st7735_1in44" or self._device == "gc9a01":
                         if self._tft_colored:
                             self._frame.text("I", sw_dot_x - self._text_size // 2, sw_dot_y - self._text_size // 2,
-                                             consts_mono_display.tft_color_theme['sw_toggle_color'])
+                                             self._theme['sw_toggle_color'])
                         else:
                             self._frame.text("I", sw_dot_x - self._text_size // 2, sw_dot_y - self._text_size // 2,
-                                             consts_mono_display.tft_color_theme['white'])
+                                             self._theme['white'])
                     else:
                         self._frame.text("I", sw_dot_x - self._text_size // 2, sw_dot_y - self._text_size // 2)
 
@@ -549,13 +1497,13 @@ class MonoDisplay:
                 bottom_pos = (y + sw_body_height - sw_state_bg_height) - gap // 2
                 if self._device == "st7735_1in44" or self._device == "gc9a01":
                     if self._tft_colored:
-                        self._frame.fill_rect(x, y, sw_body_width, sw_body_height, consts_mono_display.tft_color_theme['sw_body_color'])
-                        self._frame.fill_rect(sw_state_bg_x, bottom_pos, sw_state_bg_width, sw_state_bg_height, consts_mono_display.tft_color_theme['sw_toggle_bg_color'])
+                        self._frame.fill_rect(x, y, sw_body_width, sw_body_height, self._theme['sw_body_color'])
+                        self._frame.fill_rect(sw_state_bg_x, bottom_pos, sw_state_bg_width, sw_state_bg_height, self._theme['sw_toggle_bg_color'])
                     else:
                         self._frame.fill_rect(x, y, sw_body_width, sw_body_height,
-                                              consts_mono_display.tft_color_theme['white'])
+                                              self._theme['white'])
                         self._frame.fill_rect(sw_state_bg_x, bottom_pos, sw_state_bg_width, sw_state_bg_height,
-                                              consts_mono_display.tft_color_theme['black'])
+                                              self._theme['black'])
                 else:
                     self._frame.fill_rect(x, y, sw_body_width, sw_body_height, self.COLORED)
                     self._frame.fill_rect(sw_state_bg_x, bottom_pos, sw_state_bg_width, sw_state_bg_height, self.UNCOLORED)
@@ -563,13 +1511,13 @@ class MonoDisplay:
                 if scale <= 0.8:
                     if self._device == "st7735_1in44" or self._device == "gc9a01":
                         if self._tft_colored:
-                            self._frame.pixel(sw_dot_x - 1, bottom_pos + sw_state_bg_height // 2, consts_mono_display.tft_color_theme['sw_toggle_color'])
-                            self._frame.pixel(sw_dot_x, bottom_pos + sw_state_bg_height // 2, consts_mono_display.tft_color_theme['sw_toggle_color'])
+                            self._frame.pixel(sw_dot_x - 1, bottom_pos + sw_state_bg_height // 2, self._theme['sw_toggle_color'])
+                            self._frame.pixel(sw_dot_x, bottom_pos + sw_state_bg_height // 2, self._theme['sw_toggle_color'])
                         else:
                             self._frame.pixel(sw_dot_x - 1, bottom_pos + sw_state_bg_height // 2,
-                                              consts_mono_display.tft_color_theme['white'])
+                                              self._theme['white'])
                             self._frame.pixel(sw_dot_x, bottom_pos + sw_state_bg_height // 2,
-                                              consts_mono_display.tft_color_theme['white'])
+                                              self._theme['white'])
 
                     else:
                         self._frame.pixel(sw_dot_x - 1, bottom_pos + sw_state_bg_height // 2, 1)
@@ -577,15 +1525,19 @@ class MonoDisplay:
                 else:
                     if self._device == "st7735_1in44" or self._device == "gc9a01":
                         if self._tft_colored:
-                            self._frame.text("0", sw_dot_x - self._text_size // 2, bottom_pos + sw_state_bg_height // 2 - self._text_size // 2, consts_mono_display.tft_color_theme['sw_toggle_color'])
+                            self._frame.text("0", sw_dot_x - self._text_size // 2, bottom_pos + sw_state_bg_height // 2 - self._text_size // 2, self._theme['sw_toggle_color'])
                         else:
                             self._frame.text("0", sw_dot_x - self._text_size // 2,
                                              bottom_pos + sw_state_bg_height // 2 - self._text_size // 2,
-                                             consts_mono_display.tft_color_theme['white'])
+                                             self._theme['white'])
                     else:
                         self._frame.text("0", sw_dot_x - self._text_size // 2, bottom_pos + sw_state_bg_height // 2 - self._text_size // 2)
 
     def draw_battery_state(self, x, y, charging=False, state=50.0, show_voltage=False, voltage=0, scale=1):
+        return self._run(self._draw_battery_state_steps(x, y, charging, state, show_voltage, voltage, scale))
+
+    @recorded_steps
+    def _draw_battery_state_steps(self, x, y, charging=False, state=50.0, show_voltage=False, voltage=0, scale=1):
         default_width = 24
         default_height = default_width // 2
         default_gap = 2
@@ -605,15 +1557,37 @@ class MonoDisplay:
 
         batt_state_body_y = y + default_gap
 
+        battery_box = (x, y, battery_body_w + scale + 4, battery_body_h)  # body, nibble and masking
+        self._mark_dirty(*battery_box)
+        if show_voltage:
+            voltage_w = int(len(str(voltage)) / 2) * scale + len(str(voltage)) * self._text_size
+            voltage_box = (x, y + battery_body_h, max(battery_body_w, voltage_w),
+                           battery_body_h + default_gap * scale + self._text_size)
+            self._mark_dirty(*voltage_box)
+
         if self._device == "st7735_1in44" or self._device == "gc9a01":
             if self._tft_colored:
-                batt_body_color = consts_mono_display.tft_color_theme['battery_border_color']
-                batt_fill_color = consts_mono_display.tft_color_theme['battery_fill_color']
+                batt_body_color = self._theme['battery_border_color']
+                batt_fill_color = self._theme['battery_fill_color']
             else:
                 batt_body_color, batt_fill_color = self.COLORED, self.COLORED
         else:
             batt_body_color, batt_fill_color = self.COLORED, self.COLORED
 
+        if self._sprites is not None and not charging:
+            bars = 0  # state bucket: filled 25 % bars
+            for i, (low, high) in enumerate(((5.0, 25.0), (25.0, 50.0), (50.0, 75.0), (75.0, 100.0))):
+                if low < state < high:
+                    bars = i + 1
+            self._blit_sprite(("battery", bars, scale), x, y, battery_body_w + scale + 4, battery_body_h,
+                              self.UNCOLORED,
+                              lambda x0, y0: self._run(self._draw_battery_state_steps(x0, y0, False, state, False, 0,
+                                                                                      scale)))
+            if show_voltage:
+                self._frame.fill_rect(x, y + battery_body_h + default_gap * scale, battery_body_w, battery_body_h, self.UNCOLORED)  # body
+                self._frame.text(str(voltage), x + int(len(str(voltage)) / 2) * scale, y + battery_body_h + default_gap, batt_body_color)
+            return
+
         # draw an empty battery by default
         self._frame.rect(x, y, battery_body_w, battery_body_h, batt_body_color)  # body
         self._frame.fill_rect(x + battery_body_w, y + ((battery_body_h // 2) - (battery_body_h // 4)),
@@ -661,16 +1635,19 @@ class MonoDisplay:
                 self._frame.fill_rect(batt_state_fill_bars[i], batt_state_body_y, battery_state_body_w,
                                       battery_state_body_h, batt_fill_color)
 
-                sleep_ms(500)
+                yield 500
                 if show_voltage:
                     self._frame.fill_rect(x, y + battery_body_h + default_gap * scale, battery_body_w, battery_body_h,
                                           self.UNCOLORED)  # body
                     self._frame.text(str(voltage), x + int(len(str(voltage)) / 2) * scale,
                                      y + battery_body_h + default_gap, batt_body_color)
+                    self._mark_dirty(*voltage_box)
 
-                self.show()
+                self._mark_dirty(*battery_box)  # the previous show() sent the dirty area, this bar is new
+                yield from self._show_steps()
 
-            self._frame.fill_rect(x, y, battery_body_w + 4, battery_body_h, not batt_body_color)  # masking body
+            self._frame.fill_rect(x, y, battery_body_w + 4, battery_body_h, self.UNCOLORED)  # masking body
+            self._mark_dirty(*battery_box)
 
         else:
             if 0 < state < 5.0:
@@ -708,6 +1685,7 @@ class MonoDisplay:
             self._frame.fill_rect(x, y + battery_body_h + default_gap * scale, battery_body_w, battery_body_h, self.UNCOLORED)  # body
             self._frame.text(str(voltage), x + int(len(str(voltage)) / 2) * scale, y + battery_body_h + default_gap, batt_body_color)
 
+    @recorded
     def draw_rssi(self, x, y, state=-88, scale=1):
         default_width = 24
         default_height = default_width // 2
@@ -719,7 +1697,7 @@ class MonoDisplay:
 
         if self._device == "st7735_1in44" or self._device == "gc9a01":
             if self._tft_colored:
-                rssi_color = consts_mono_display.tft_color_theme['wifi_rssi_color']
+                rssi_color = self._theme['wifi_rssi_color']
             else:
                 rssi_color = self.COLORED
         else:
@@ -746,109 +1724,63 @@ class MonoDisplay:
         else:
             pass
 
+        if num_bars_to_draw:
+            rssi_top = rssi_state_body_y_25 - (num_bars_to_draw - 1) * bar_step * scale
+            self._mark_dirty(x, rssi_top, gap_states * (num_bars_to_draw - 1) + rssi_state_body_w,
+                             rssi_state_body_y_25 + rssi_state_body_h_25 - rssi_top)
+            if self._sprites is not None:
+                self._blit_sprite(("rssi", num_bars_to_draw, scale), x, y,
+                                  gap_states * (num_bars_to_draw - 1) + rssi_state_body_w, rssi_body_h,
+                                  self.UNCOLORED, lambda x0, y0: self.draw_rssi(x0, y0, state, scale))
+                return
+
         for i in range(num_bars_to_draw):
             self._frame.fill_rect(x + gap_states * i, rssi_state_body_y_25 - (i * bar_step * scale), rssi_state_body_w, rssi_state_body_h_25 + (i * bar_step * scale), rssi_color)
 
     def log(self, text, textalign="left"):
+        return self._run(self._log_steps(text, textalign))
+
+    def _log_steps(self, text, textalign="left"):
         x_pos = 0
 
         if textalign == "left":
             x_pos = 0
 
-        self.flushframe()  # clear frame
+        if not self._text_mode:  # in text mode the framebuffer belongs to graphics only
+            self.flushframe()  # clear frame
 
         if isinstance(text, str):
-            if self._device == "1in54_epd" and self._epd_slow_mode:    # dealing with e-paper in slow mode:
-                if len(text) <= self._max_line_width:
-                    if len(self._page) >= self._max_line_number:
-                        self._page.pop(0)
-                        self._page.append(text)
-                    else:
-                        self._page.append(text)
-                else:
-                    text_a, text_b = text[0:self._max_line_width], text[self._max_line_width::]
-                    if len(self._page) >= self._max_line_number:
-                        self._page.pop(0)
-                        self._page.pop(0)
-                        self._page.append(text_a)
-                        self._page.append(text_b)
-                    else:
-                        self._page.append(text_a)
-                        self._page.append(text_b)
-
-                # render page:
-                self.flushframe()  # clear frame
-
-                for line_s in range(len(self._page)):
-                    if textalign == "center":
-                        x_pos = (self.W // 2) - ((len(self._page[line_s]) * self._text_size) // 2)
-                    elif textalign == "right":
-                        x_pos = self.W - len(self._page[line_s]) * self._text_size
-                    y_pos = line_s * self._text_size
-                    self._frame.text(self._page[line_s], x_pos, y_pos, self.COLORED)
-
-                if len(self._page) < self._max_line_number:
-                    if not len(self._page) % 4:
-                        self.show()  # show framebuf
-                else:
-                    self._counter_log_slow_mode += 1
-                    if not self._counter_log_slow_mode % 8:
-                        self.show()  # show framebuf
-
-            else:                                                      # dealing with all the displays in normal mode:
-                if len(text) <= self._max_line_width:
-                    if len(self._page) >= self._max_line_number:
-                        self._page.pop(0)
-                        self._page.append(text)
+            if len(text) <= self._max_line_width:
+                self._log.append(text)
+            else:
+                self._log.append(text[0:self._max_line_width])
+                self._log.append(text[self._max_line_width::])
+
+            # the screen shows the newest lines, read from the arena:
+            page = self._log.lines(len(self._log) - self._max_line_number, len(self._log))
+            if self._text_mode:
+                yield from self._text_mode_steps([str(line, "utf-8") for line in page], textalign)
+                return
+
+            for line in range(len(page)):
+                y_pos = line * self._text_size
+                text_line = str(page[line], "utf-8")  # framebuf text() takes a str
+                if self._device == "st7735_1in44" or self._device == "gc9a01":
+                    if self._tft_colored:
+                        self._text(text_line, x_pos, y_pos, self._theme['text_color'], textalign)
                     else:
-                        self._page.append(text)
-
-                    if self._scrollable_log:
-                        if len(self._page_scrollable) >= self._max_line_number * 8:  # set scrollable len here
-                            self._page_scrollable.pop(0)
-                            self._page_scrollable.append(text)
-                        else:
-                            self._page_scrollable.append(text)
+                        self._text(text_line, x_pos, y_pos, self.COLORED, textalign)
 
                 else:
-                    text_a, text_b = text[0:self._max_line_width], text[self._max_line_width::]
-                    if len(self._page) >= self._max_line_number:
-                        self._page.pop(0)
-                        self._page.pop(0)
-                        self._page.append(text_a)
-                        self._page.append(text_b)
-                    else:
-                        self._page.append(text_a)
-                        self._page.append(text_b)
-
-                    if self._scrollable_log:
-                        if len(self._page_scrollable) >= self._max_line_number * 8:
-                            self._page_scrollable.pop(0)
-                            self._page_scrollable.pop(0)
-                            self._page_scrollable.append(text_a)
-                            self._page_scrollable.append(text_b)
-                        else:
-                            self._page_scrollable.append(text_a)
-                            self._page_scrollable.append(text_b)
-
-                for line in range(len(self._page)):
-                    if textalign == "center":
-                        x_pos = (self.W // 2) - ((len(self._page[line]) * self._text_size) // 2)
-                    elif textalign == "right":
-                        x_pos = self.W - len(self._page[line]) * self._text_size
-                    y_pos = line * self._text_size
-                    if self._device == "st7735_1in44" or self._device == "gc9a01":
-                        if self._tft_colored:
-                            self._frame.text(self._page[line], x_pos, y_pos, consts_mono_display.tft_color_theme['text_color'])
-                        else:
-                            self._frame.text(self._page[line], x_pos, y_pos, self.COLORED)
+                    self._text(text_line, x_pos, y_pos, self.COLORED, textalign)
+            self._mark_dirty(0, 0, self.W, len(page) * self._text_size)
 
-                    else:
-                        self._frame.text(self._page[line], x_pos, y_pos, self.COLORED)
-
-                self.show()  # show framebuf line by line
+            yield from self._show_steps()  # show framebuf line by line
 
     def show_scrollable_log(self, textalign):
+        return self._run(self._show_scrollable_log_steps(textalign))
+
+    def _show_scrollable_log_steps(self, textalign):
         self._button_up_pressed = not self._up_button.value()
         self._button_dwn_pressed = not self._dwn_button.value()
 
@@ -858,46 +1790,61 @@ class MonoDisplay:
             if self.pos_set_scroll_log > 0:
                 self.pos_set_scroll_log -= 1
 
-        self.flushframe()  # clear framebuf first
+        if not self._text_mode:
+            self.flushframe()  # clear framebuf first
 
         # pos_set_scroll_log = 0  # point to the start index then set the end pos from start index -> 'window'
         active_page_window_start = self.pos_set_scroll_log
         active_page_window_end = active_page_window_start + self._max_line_number
 
-        if active_page_window_end > len(self._page_scrollable):
-            active_page_window_end = active_page_window_end - (active_page_window_end - len(self._page_scrollable))
+        if active_page_window_end > len(self._log):
+            active_page_window_end = active_page_window_end - (active_page_window_end - len(self._log))
 
         active_window_page = []
 
-        if len(self._page_scrollable) >= self._max_line_number:
-            for index in range(active_page_window_start, active_page_window_end):
-                active_window_page.append(self._page_scrollable[index])  # create window first
+        if len(self._log) >= self._max_line_number:
+            # create window first, memoryviews of the arena decoded for framebuf text()
+            active_window_page = [str(line, "utf-8")
+                                  for line in self._log.lines(active_page_window_start, active_page_window_end)]
 
         # --------  RENDER SCROLLABLE PAGE  -----------
-        for line in range(len(active_window_page)):
-            if textalign == "center":
-                x_pos = (self.W // 2) - ((len(active_window_page[line]) * self._text_size) // 2)
-            elif textalign == "right":
-                x_pos = self.W - len(active_window_page[line]) * self._text_size
-            else:
-                x_pos = 0
+        if self._text_mode:
+            yield from self._text_mode_steps(active_window_page, textalign)
+            return
 
+        for line in range(len(active_window_page)):
             y_pos = line * self._text_size
 
             if self._device == "st7735_1in44":
                 if self._tft_colored:
-                    self._frame.text(active_window_page[line], x_pos, y_pos, consts_mono_display.tft_color_theme['text_color'])
+                    self._text(active_window_page[line], 0, y_pos, self._theme['text_color'], textalign)
                 else:
-                    self._frame.text(active_window_page[line], x_pos, y_pos,
-                                     0xFFFF)
+                    self._text(active_window_page[line], 0, y_pos,
+                               0xFFFF, textalign)
             else:
-                self._frame.text(active_window_page[line], x_pos, y_pos,
-                                 self.COLORED)
-        self.show()
+                self._text(active_window_page[line], 0, y_pos,
+                           self.COLORED, textalign)
+        self._mark_dirty(0, 0, self.W, len(active_window_page) * self._text_size)
+        yield from self._show_steps()
         # --------  RENDER SCROLLABLE PAGE END  --------
 
+    def _text_mode_steps(self, lines, textalign):
+        """ Write log lines to the ST7920's DDRAM, the driver sends only the character cells that changed """
+        self.wait_flush()  # text and graphics share the bus
+        for row in range(self._max_line_number):
+            line = lines[row] if row < len(lines) else ""
+            if textalign == "center":
+                line = " " * ((self._max_line_width - len(line)) // 2) + line
+            elif textalign == "right":
+                line = " " * (self._max_line_width - len(line)) + line
+            self._bus_bytes += self._display.text(row, line)
+            yield 0
+
     def log_rtc(self, rtc_datetime=None):
         """ prints local datetime to screen using self.log() """
+        return self._run(self._log_rtc_steps(rtc_datetime))
+
+    def _log_rtc_steps(self, rtc_datetime=None):
         now = rtc_datetime  # ->(year, month, day, weekday, hours, minutes, seconds, subseconds)
         fdate, ftime = "", ""
 
@@ -927,12 +1874,16 @@ class MonoDisplay:
         fdate = "{year}.{month}.{day}.".format(year=year, month=month, day=day)
         ftime = "{hours}:{minutes}:{seconds}".format(hours=hours, minutes=minutes, seconds=seconds)
 
-        self.log(text="-" * self._max_line_width, textalign='left')
-        self.log(text=fdate, textalign='right')
-        self.log(text=ftime, textalign='right')
-        self.log(text="-" * self._max_line_width, textalign='left')
+        yield from self._log_steps(text="-" * self._max_line_width, textalign='left')
+        yield from self._log_steps(text=fdate, textalign='right')
+        yield from self._log_steps(text=ftime, textalign='right')
+        yield from self._log_steps(text="-" * self._max_line_width, textalign='left')
 
     def progressbar(self, col_pos, row_pos, width, height, state=50, filled=False):
+        return self._run(self._progressbar_steps(col_pos, row_pos, width, height, state, filled))
+
+    @recorded_steps
+    def _progressbar_steps(self, col_pos, row_pos, width, height, state=50, filled=False):
         width = width
         height = height
         columns, rows = [], []
@@ -968,11 +1919,12 @@ class MonoDisplay:
 
         if self._device == "st7735_1in44" or self._device == "gc9a01":
             if self._tft_colored:
-                self._frame.rect(x_0, y_0, width, height, consts_mono_display.tft_color_theme['progbar_border_color'])
+                self._frame.rect(x_0, y_0, width, height, self._theme['progbar_border_color'])
             else:
                 self._frame.rect(x_0, y_0, width, height, self.COLORED)
         else:
             self._frame.rect(x_0, y_0, width, height, colored)
+        self._mark_dirty(x_0, y_0, width, height)
 
         if state > 100:
             state = 100
@@ -988,14 +1940,15 @@ class MonoDisplay:
 
                     if self._device == "st7735_1in44" or self._device == "gc9a01":
                         if self._tft_colored:
-                            self._frame.fill_rect(x_0 + border, y_0 + border, width_progress - border, height - border * 2, consts_mono_display.tft_color_theme['progbar_fill_color'])
+                            self._frame.fill_rect(x_0 + border, y_0 + border, width_progress - border, height - border * 2, self._theme['progbar_fill_color'])
                         else:
                             self._frame.fill_rect(x_0 + border, y_0 + border, width_progress - border,
                                                   height - border * 2, self.COLORED)
                     else:
                         self._frame.fill_rect(x_0 + border, y_0 + border, width_progress - border, height - border * 2, colored)
 
-                    self.show()
+                    self._mark_dirty(x_0, y_0, width, height)
+                    yield from self._show_steps()
 
         else:
             for m in range(state):
@@ -1008,42 +1961,49 @@ class MonoDisplay:
                     if x_2 < width:
                         if self._device == "st7735_1in44" or self._device == "gc9a01":
                             if self._tft_colored:
-                                self._frame.line(x_1 - 1, y_1, x_2 - 1, y_2, consts_mono_display.tft_color_theme['progbar_fill_color'])
-                                self._frame.line(x_1, y_1, x_2, y_2, consts_mono_display.tft_color_theme['progbar_fill_color'])
-                                self._frame.line(x_1 + 1, y_1, x_2 + 1, y_2, consts_mono_display.tft_color_theme['progbar_fill_color'])
+                                self._frame.line(x_1 - 1, y_1, x_2 - 1, y_2, self._theme['progbar_fill_color'])
+                                self._frame.line(x_1, y_1, x_2, y_2, self._theme['progbar_fill_color'])
+                                self._frame.line(x_1 + 1, y_1, x_2 + 1, y_2, self._theme['progbar_fill_color'])
                             else:
                                 self._frame.line(x_1 - 1, y_1, x_2 - 1, y_2,
-                                                 consts_mono_display.tft_color_theme['white'])
+                                                 self._theme['white'])
                                 self._frame.line(x_1, y_1, x_2, y_2,
-                                                 consts_mono_display.tft_color_theme['white'])
+                                                 self._theme['white'])
                                 self._frame.line(x_1 + 1, y_1, x_2 + 1, y_2,
-                                                 consts_mono_display.tft_color_theme['white'])
+                                                 self._theme['white'])
                         else:
                             self._frame.line(x_1 - 1, y_1, x_2 - 1, y_2, colored)
                             self._frame.line(x_1, y_1, x_2, y_2, colored)
                             self._frame.line(x_1 + 1, y_1, x_2 + 1, y_2, colored)
-                        self.show()
+                        self._mark_dirty(x_0, y_0, width, height)
+                        yield from self._show_steps()
 
     def draw_str(self, x, y, text="n/a", blit=False):
+        return self._run(self._draw_str_steps(x, y, text, blit))
+
+    @recorded_steps
+    def _draw_str_steps(self, x, y, text="n/a", blit=False):
         if blit:
+            self._mark_dirty(x, y, len(text) * self._text_size, self._text_size)
             if self._device == "st7735_1in44" or self._device == "gc9a01":
                 if self._tft_colored:
-                    self._frame.text(text, x, y, consts_mono_display.tft_color_theme['text_color'])
+                    self._text(text, x, y, self._theme['text_color'])
                 else:
-                    self._frame.text(text, x, y, self.COLORED)
+                    self._text(text, x, y, self.COLORED)
             else:
-                self._frame.text(text, x, y, self.COLORED)
+                self._text(text, x, y, self.COLORED)
         else:
             self.flushframe()
-            self.clear()
+            yield from self._clear_steps()
+            self._mark_dirty(x, y, len(text) * self._text_size, self._text_size)
 
             if self._device == "st7735_1in44" or self._device == "gc9a01":
                 if self._tft_colored:
-                    self._frame.text(text, x, y, consts_mono_display.tft_color_theme['text_color'])
+                    self._text(text, x, y, self._theme['text_color'])
                 else:
-                    self._frame.text(text, x, y, self.COLORED)
+                    self._text(text, x, y, self.COLORED)
             else:
-                self._frame.text(text, x, y, self.COLORED)
+                self._text(text, x, y, self.COLORED)
 
     @staticmethod
     def calculate_gear_coordinates(radius, angles):
@@ -1063,6 +2023,9 @@ class MonoDisplay:
             self.draw_circle(x=frame_x_pos + int(x), y=frame_y_pos + int(y), radius=rad, colored=self.COLORED, filled=1)
 
     def render_gear(self, x_pos, y_pos, len_in_frames, obj_r, points, points_r, wait):
+        return self._run(self._render_gear_steps(x_pos, y_pos, len_in_frames, obj_r, points, points_r, wait))
+
+    def _render_gear_steps(self, x_pos, y_pos, len_in_frames, obj_r, points, points_r, wait):
         rad_shift = 0
         rad_moving = 0
         frames_coordinates = []
@@ -1087,9 +2050,10 @@ class MonoDisplay:
             # Draw each frame:
             rad_moving += rad_shift
             self.draw_gear(x_pos, y_pos, rotated_coordinates, rad_moving)
-            self.show()
-            sleep_ms(wait)
+            yield from self._show_steps()
+            yield wait
 
+    @recorded
     def draw_save_glyph(self, x, y):
         # not working on TFT screen
         save_glyph = consts_mono_display.save_glyph  # save glyph 32x32
@@ -1109,9 +2073,10 @@ class MonoDisplay:
 
         if self._device == "1in54_epd":
             self._frame.fill(0)
-            self._frame.blit(img_fbuf_save_glyph, x, y, self.COLORED)
+            self._blit(img_fbuf_save_glyph, x, y, self.COLORED, 32, 32)
         else:
             self._frame.fill(0x0f89)
-            self._frame.blit(img_fbuf_save_glyph, x, y, set_color)
+            self._blit(img_fbuf_save_glyph, x, y, set_color, 32, 32)
+        self._mark_full()  # background is filled as well
 
         # self.show()
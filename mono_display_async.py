@@ -0,0 +1,103 @@
+from mono_display import MonoDisplay
+from utime import ticks_ms, ticks_diff, ticks_add
+try:
+    import uasyncio as asyncio
+except ImportError:
+    import asyncio
+
+
+"""
+
+2026-10-18: AsyncMonoDisplay -> same drawing API as MonoDisplay, but every method which waits for the bus,
+            the panel or a fade is a coroutine, framebuffer is streamed in chunks and other tasks run in between:
+            await show(full_update=False), await clear(), await log(text, textalign), await log_rtc(rtc_datetime),
+            await show_scrollable_log(textalign), await progressbar(...), await render_gear(...),
+            await draw_battery_state(...), await draw_str(...), await lcd_backlight(...),
+            await set_oled_brightness(amount), await refresh_epaper(), await flush_pending()
+            construction is still blocking (bus, driver init and the first e-paper erase)
+2026-10-18: coalesce=True -> the pending frame is sent by a task when it's due, no machine.Timer is used
+
+"""
+
+
+if hasattr(asyncio, "sleep_ms"):
+    _sleep_ms = asyncio.sleep_ms
+else:
+    async def _sleep_ms(ms):  # CPython asyncio
+        await asyncio.sleep(ms / 1000)
+
+
+class AsyncMonoDisplay(MonoDisplay):
+    def __init__(self, *args, **kwargs):
+        self._coalesce_task = None  # sends the pending frame of coalesce mode
+        self._coalesce_due_at = 0
+        super().__init__(*args, **kwargs)
+        self._bus_lock = asyncio.Lock()  # one flush at a time, windows must not interleave on the bus
+
+    def _arm_coalesce(self, wait):
+        self._coalesce_due_at = ticks_add(ticks_ms(), wait)
+        if self._coalesce_task is None:
+            self._coalesce_task = asyncio.create_task(self._coalesce_loop())
+
+    async def _coalesce_loop(self):
+        try:
+            while self._pending_since is not None:
+                wait = ticks_diff(self._coalesce_due_at, ticks_ms())
+                if wait > 0:
+                    await _sleep_ms(wait)
+                    continue  # a show() meanwhile may have moved the deadline
+                wait = await self.flush_pending()
+                if wait:
+                    self._coalesce_due_at = ticks_add(ticks_ms(), wait)
+        finally:
+            self._coalesce_task = None
+
+    async def _run_async(self, steps):
+        """ Drive a step generator to its end, 0 ms steps just give the other tasks a turn """
+        async with self._bus_lock:
+            try:
+                while True:
+                    await _sleep_ms(next(steps))
+            except StopIteration as done:
+                return done.value
+
+    async def show(self, full_update=False):
+        return await self._run_async(self._show_steps(full_update))
+
+    async def flush_pending(self):
+        return await self._run_async(self._flush_pending_steps())
+
+    async def clear(self):
+        return await self._run_async(self._clear_steps())
+
+    async def refresh_epaper(self):
+        return await self._run_async(self._refresh_epaper_steps())
+
+    async def lcd_backlight(self, value, binary=False, inverted=False):
+        return await self._run_async(self._lcd_backlight_steps(value, binary, inverted))
+
+    async def set_oled_brightness(self, amount):
+        return await self._run_async(self._set_oled_brightness_steps(amount))
+
+    async def draw_battery_state(self, x, y, charging=False, state=50.0, show_voltage=False, voltage=0, scale=1):
+        return await self._run_async(self._draw_battery_state_steps(x, y, charging, state, show_voltage, voltage,
+                                                                    scale))
+
+    async def log(self, text, textalign="left"):
+        return await self._run_async(self._log_steps(text, textalign))
+
+    async def show_scrollable_log(self, textalign):
+        return await self._run_async(self._show_scrollable_log_steps(textalign))
+
+    async def log_rtc(self, rtc_datetime=None):
+        return await self._run_async(self._log_rtc_steps(rtc_datetime))
+
+    async def progressbar(self, col_pos, row_pos, width, height, state=50, filled=False):
+        return await self._run_async(self._progressbar_steps(col_pos, row_pos, width, height, state, filled))
+
+    async def draw_str(self, x, y, text="n/a", blit=False):
+        return await self._run_async(self._draw_str_steps(x, y, text, blit))
+
+    async def render_gear(self, x_pos, y_pos, len_in_frames, obj_r, points, points_r, wait):
+        return await self._run_async(self._render_gear_steps(x_pos, y_pos, len_in_frames, obj_r, points, points_r,
+                                                             wait))
@@ -0,0 +1,66 @@
+import framebuf
+
+
+"""
+
+2026-10-18: ScaledFrame -> stands in for the framebuf of a TFT rendered at 1/scale resolution, the drawing calls
+            take screen coordinates and paint the matching render pixels, text and blitted framebufs come out
+            scale times bigger, MonoDisplay(render_scale=2) upscales the frame on show()
+
+"""
+
+
+class ScaledFrame:
+    def __init__(self, width, height, scale, fmt=framebuf.RGB565, bytes_per_px=2):
+        self.scale = scale
+        self.width = width // scale  # render resolution
+        self.height = height // scale
+        self.data = bytearray(self.width * self.height * bytes_per_px)
+        self._fb = framebuf.FrameBuffer(self.data, self.width, self.height, fmt)
+
+    # --------  framebuf drawing API, in screen coordinates  --------
+    def fill(self, c):
+        self._fb.fill(c)
+
+    def pixel(self, x, y, c=None):
+        s = self.scale
+        if c is None:
+            return self._fb.pixel(x // s, y // s)
+        self._fb.pixel(x // s, y // s, c)
+
+    def hline(self, x, y, w, c):
+        if w > 0:
+            s = self.scale
+            self._fb.hline(x // s, y // s, (x + w - 1) // s - x // s + 1, c)
+
+    def vline(self, x, y, h, c):
+        if h > 0:
+            s = self.scale
+            self._fb.vline(x // s, y // s, (y + h - 1) // s - y // s + 1, c)
+
+    def line(self, x1, y1, x2, y2, c):
+        s = self.scale
+        self._fb.line(x1 // s, y1 // s, x2 // s, y2 // s, c)
+
+    def rect(self, x, y, w, h, c, f=False):
+        if w > 0 and h > 0:
+            s = self.scale
+            x0, y0 = x // s, y // s
+            w, h = (x + w - 1) // s - x0 + 1, (y + h - 1) // s - y0 + 1
+            if f:
+                self._fb.fill_rect(x0, y0, w, h, c)
+            else:
+                self._fb.rect(x0, y0, w, h, c)
+
+    def fill_rect(self, x, y, w, h, c):
+        self.rect(x, y, w, h, c, True)
+
+    def text(self, s, x, y, c=1):
+        self._fb.text(s, x // self.scale, y // self.scale, c)
+
+    def blit(self, fbuf, x, y, key=-1, palette=None):
+        if palette is None:
+            self._fb.blit(fbuf, x // self.scale, y // self.scale, key)
+        else:
+            self._fb.blit(fbuf, x // self.scale, y // self.scale, key, palette)
+    # --------  framebuf drawing API END  --------
@@ -0,0 +1,54 @@
+"""
+
+2026-10-18: SpriteCache -> small framebufs of rendered widgets kept by key under a byte budget, the least recently
+            used ones are dropped first, MonoDisplay(sprite_cache_bytes=n) blits draw_battery_state(),
+            draw_rssi() and draw_switch() from it, text_cache_bytes=n keeps the log() and draw_str() lines in one
+
+"""
+
+
+class SpriteCache:
+    def __init__(self, budget):
+        self.budget = budget  # bytes of framebuf data kept at most
+        self.used = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}  # key -> (framebuf, bytes)
+        self._order = []  # keys, least recently used first
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        if self._order[-1] != key:
+            self._order.remove(key)
+            self._order.append(key)
+        return entry[0]
+
+    def put(self, key, fbuf, size):
+        """ Keep fbuf under key, evicting the least recently used ones until it fits, a sprite bigger than
+        the whole budget is not kept """
+        if key in self._entries:
+            self.used -= self._entries.pop(key)[1]
+            self._order.remove(key)
+        if size > self.budget:
+            return
+        while self.used + size > self.budget:
+            self.used -= self._entries.pop(self._order.pop(0))[1]
+        self._entries[key] = (fbuf, size)
+        self._order.append(key)
+        self.used += size
+
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def clear(self):
+        self._entries = {}
+        self._order = []
+        self.used = 0